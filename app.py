@@ -3,10 +3,19 @@ GitHub Identicon Generator - Streamlit Interface
 A minimal, clean interface for generating GitHub-style identicons.
 """
 
+import json
 import streamlit as st
 from src.styles import CSS, GEAR_ICON
-from src.github_api import fetch_user_data
-from src.identicon import generate_identicon_from_id
+from src.cache import TTLCache
+from src.github_api import (
+    fetch_user_data,
+    fetch_user_data_async,
+    get_api_headers,
+    prefetch_user_lists,
+    list_cursor,
+    RATE_LIMIT_ERROR
+)
+from src.identicon import Identicon
 from src.ui.components import (
     render_token_settings,
     render_avatar_comparison,
@@ -14,7 +23,10 @@ from src.ui.components import (
     render_repos_list,
     render_hash_breakdown,
     render_how_it_works,
-    render_follow_list
+    render_follow_list,
+    render_pager,
+    REPOS_PAGE_SIZE,
+    FOLLOW_PAGE_SIZE
 )
 
 # Page configuration
@@ -29,27 +41,241 @@ st.set_page_config(
 st.markdown(CSS, unsafe_allow_html=True)
 
 
-def generate_identicon_workflow(username: str, search_mode: str = 'auto') -> tuple:
+# Lookups are shared by every session for LOOKUP_TTL seconds, within LOOKUP_CACHE_BYTES
+LOOKUP_TTL = 300
+LOOKUP_CACHE_BYTES = 64 * 1024 * 1024
+# Rough size charged for the REST lists a cached lookup is still fetching
+PENDING_LISTS_BYTES = 48 * 1024
+
+
+def _lookup_size(entry: tuple) -> int:
+    """Estimated memory of a cached (user_data, list_futures) lookup."""
+    user_data, list_futures = entry
+    return len(json.dumps(user_data, default=str)) + (PENDING_LISTS_BYTES if list_futures else 0)
+
+
+@st.cache_resource
+def get_lookup_cache() -> TTLCache:
+    """Process-wide lookup cache shared by all sessions."""
+    return TTLCache(ttl=LOOKUP_TTL, max_bytes=LOOKUP_CACHE_BYTES, sizeof=_lookup_size)
+
+
+def lookup_scope(token: str = None) -> str:
+    """
+    Cache scope of a lookup. Only public data is fetched, so every token shares
+    one scope; it stays separate from anonymous lookups, whose results differ in shape.
+    """
+    return 'token' if token else 'anonymous'
+
+
+def lookup_key(username: str, search_mode: str, token: str = None) -> tuple:
+    """Cache key of a lookup as typed: (kind, value, scope), resolved the way fetch_user_profile does."""
+    is_id = search_mode == 'id' or (search_mode == 'auto' and username.isdigit())
+    return ('id' if is_id else 'login'), username.lower(), lookup_scope(token)
+
+
+def lookup_aliases(user_data: dict, scope: str) -> list:
+    """Keys a resolved lookup is also cached under, so ID and login queries meet."""
+    keys = [('id', str(user_data['id']), scope)]
+    if user_data.get('login'):
+        keys.append(('login', user_data['login'].lower(), scope))
+    return keys
+
+
+def cached_user_data(username: str, search_mode: str, token: str = None) -> tuple:
+    """
+    Fetch a profile through the shared lookup cache, starting its list fetches once.
+    
+    Returns:
+        tuple: (session-private copy of user_data or None, list futures or None, error or None)
+    """
+    def compute():
+        user_data, error = fetch_user_data(username, token, search_mode, backend='auto', include_lists=False)
+        if error:
+            return None, error
+        list_futures = {}
+        if 'repos_list' not in user_data:
+            list_futures = prefetch_user_lists(user_data['login'], get_api_headers(token))
+        return (user_data, list_futures), None
+    
+    scope = lookup_scope(token)
+    entry, error = get_lookup_cache().get_or_compute(
+        lookup_key(username, search_mode, token), compute,
+        lambda entry: lookup_aliases(entry[0], scope)
+    )
+    if error:
+        return None, None, error
+    # Sessions add lists and identicon metadata to user_data; keep the shared copy clean
+    return dict(entry[0]), entry[1], None
+
+
+def generate_identicon_workflow(username: str, search_mode: str = 'auto', identicon_only: bool = False) -> tuple:
     """
-    Orchestrate the generation workflow: fetch data -> generate image.
-    Uses session state for token if available.
+    Orchestrate the generation workflow: fetch profile -> describe identicon.
+    Uses session state for token if available. Profiles come from the shared
+    lookup cache, so sessions looking up the same account reuse one fetch. Pixels
+    are only rendered when the identicon is displayed or downloaded, and the REST
+    lists are fetched in the background and picked up by their sections.
+    With identicon_only, uncached numeric IDs skip the network entirely and the
+    profile is looked up in the background.
     """
     token = st.session_state.get('github_token')
+    st.session_state.pop('profile_future', None)
+    # A new lookup starts every list on its first page with freshly fetched items
+    st.session_state.pop('list_cursors', None)
+    st.session_state.pop('list_pages', None)
     
-    # 1. Fetch data from GitHub API
-    user_data, error = fetch_user_data(username, token, search_mode)
+    # 1. Fetch data from GitHub API (a single GraphQL round-trip when a token is set,
+    # otherwise only the REST profile call), unless another session already did
+    key = lookup_key(username, search_mode, token)
+    if identicon_only and key[0] == 'id' and get_lookup_cache().get(key) is None:
+        user_data, error = fetch_user_data(username, token, search_mode, identicon_only=True)
+        list_futures = {}
+    else:
+        user_data, list_futures, error = cached_user_data(username, search_mode, token)
     
     if error:
         return None, None, error
+    
+    if user_data.get('offline'):
+        st.session_state['profile_future'] = fetch_user_data_async(
+            user_data['id'], token, 'id', backend='auto', include_lists=False
+        )
+    st.session_state['list_futures'] = list_futures
         
-    # 2. Generate identicon from User ID
+    # 2. Describe identicon from User ID
     # Note: user_data['id'] is guaranteed to exist if no error
-    img, metadata = generate_identicon_from_id(user_data['id'])
+    identicon = Identicon.from_id(user_data['id'])
     
     # Merge metadata (hash, color, etc.) into user_data
-    user_data.update(metadata)
+    user_data.update(identicon.metadata())
     
-    return img, user_data, None
+    return identicon, user_data, None
+
+
+def load_user_list(user_data: dict, key: str, timeout: float = 10) -> list:
+    """
+    Return one of the user's lists, waiting for its background fetch on first view.
+    A list cut short by an error keeps the pages that arrived; its paging cursor
+    requests the rest again.
+    """
+    if key not in user_data:
+        future = st.session_state.get('list_futures', {}).get(key)
+        try:
+            user_data[key] = future.result(timeout=timeout)[0] if future else []
+        except Exception:
+            user_data[key] = []
+    return user_data[key]
+
+
+def get_list_cursor(user_data: dict, key: str):
+    """
+    The session's paging cursor into one of the user's lists, continuing after the loaded first page.
+    Cursors are per credential scope, so saving a token starts a fresh, authenticated cursor.
+    """
+    token = st.session_state.get('github_token')
+    cursors = st.session_state.setdefault('list_cursors', {})
+    cursor_key = (user_data['login'], key, lookup_scope(token))
+    if cursor_key not in cursors:
+        cursors[cursor_key] = list_cursor(
+            user_data['login'], key, get_api_headers(token),
+            items=load_user_list(user_data, key)
+        )
+    return cursors[cursor_key]
+
+
+def list_page(user_data: dict, key: str, total: int, page_size: int) -> tuple:
+    """
+    Items of the current page of a list, fetching pages from GitHub only as the user pages forward.
+    
+    Returns:
+        tuple: (items on the page, page index, page count, page offset, error or None)
+    """
+    pages = st.session_state.setdefault('list_pages', {})
+    page_key = (user_data['login'], key)
+    page = pages.get(page_key, 0)
+    
+    cursor = get_list_cursor(user_data, key)
+    start = page * page_size
+    cursor.fetch_until(min(start + page_size, total or 0))
+    known = len(cursor.items) if cursor.exhausted else max(total or 0, len(cursor.items))
+    page_count = max(1, -(-known // page_size))
+    
+    # Have the following page ready by the time it is requested, once the user is paging
+    # (or has a token): on first view it would cost anonymous users budget for pages never seen
+    if page > 0 or st.session_state.get('github_token'):
+        cursor.prefetch(min(start + 2 * page_size, known))
+    
+    # Offer the token panel (rendered outside this fragment) with one full rerun
+    if cursor.error == RATE_LIMIT_ERROR and not st.session_state.get('show_token_settings'):
+        st.session_state['show_token_settings'] = True
+        st.rerun()
+    return cursor.items[start:start + page_size], page, page_count, start, cursor.error
+
+
+def pager(user_data: dict, key: str, key_prefix: str, page: int, page_count: int):
+    """Page controls of one list, updating its page before the fragment reruns."""
+    def on_page(new_page):
+        st.session_state['list_pages'][(user_data['login'], key)] = new_page
+    render_pager(key_prefix, page, page_count, on_page)
+
+
+@st.fragment
+def repos_section(user_data: dict):
+    """Repositories, one page at a time."""
+    with st.spinner("Loading repositories..."):
+        items, page, page_count, _, error = list_page(
+            user_data, 'repos_list', user_data.get('public_repos', 0), REPOS_PAGE_SIZE
+        )
+    render_repos_list(user_data, items)
+    if error:
+        st.caption(error)
+    pager(user_data, 'repos_list', "repos", page, page_count)
+
+
+@st.fragment
+def follow_section(user_data: dict, title: str, list_key: str, count_key: str, key_prefix: str):
+    """Followers or following, one page at a time."""
+    with st.spinner(f"Loading {title.lower()}..."):
+        items, page, page_count, offset, error = list_page(
+            user_data, list_key, user_data.get(count_key, 0), FOLLOW_PAGE_SIZE
+        )
+    render_follow_list(title, items, user_data.get(count_key, 0), key_prefix, user_data.get('login'), offset)
+    if error:
+        st.caption(error)
+    pager(user_data, list_key, key_prefix, page, page_count)
+
+
+@st.fragment(run_every=1)
+def enrichment_section(user_data: dict):
+    """Poll the background profile lookup of an offline result and merge it when ready."""
+    future = st.session_state.get('profile_future')
+    if future is None:
+        return
+    if not future.done():
+        st.caption("Loading GitHub profile in the background...")
+        return
+    
+    del st.session_state['profile_future']
+    try:
+        profile, error = future.result()
+    except Exception as e:
+        profile, error = None, str(e)
+    if error:
+        st.caption(f"Profile unavailable: {error}")
+        return
+    
+    token = st.session_state.get('github_token')
+    list_futures = {}
+    if 'repos_list' not in profile:
+        list_futures = prefetch_user_lists(profile['login'], get_api_headers(token))
+    scope = lookup_scope(token)
+    get_lookup_cache().put(('id', str(profile['id']), scope), (profile, list_futures), lookup_aliases(profile, scope))
+    
+    user_data.update(profile)
+    user_data['offline'] = False
+    st.session_state['list_futures'] = list_futures
+    st.rerun()
 
 
 # Main UI
@@ -72,6 +298,11 @@ with st.form(key="lookup_form"):
         key="search_mode_input"
     )
 
+    identicon_only = st.checkbox(
+        "Identicon only (numeric IDs skip GitHub; profile loads in the background)",
+        key="identicon_only_input"
+    )
+
     st.markdown('<div style="height: 10px;"></div>', unsafe_allow_html=True) # Spacer
 
     col1, col2 = st.columns([5, 1])
@@ -93,60 +324,60 @@ mode_map = {
 selected_mode = mode_map[search_option]
 
 # Helper for handling lookup
-def handle_lookup(target_username, mode):
+def handle_lookup(target_username, mode, identicon_only=False):
     if not target_username or not target_username.strip():
         st.warning("Please enter a GitHub username")
         return
 
     with st.spinner("Looking up..."):
-        img, user_data, error = generate_identicon_workflow(target_username.strip(), mode)
+        identicon, user_data, error = generate_identicon_workflow(target_username.strip(), mode, identicon_only)
         
         if error:
             st.error(error)
             # Check if rate limit error
-            if "rate limit" in error.lower() or "Rate limit" in error:
+            if error == RATE_LIMIT_ERROR:
                 st.session_state['show_token_settings'] = True
         else:
             # Store in session state
-            st.session_state['generated_image'] = img
+            st.session_state['identicon'] = identicon
             st.session_state['generated_username'] = target_username.strip()
             st.session_state['user_data'] = user_data
             st.session_state['show_token_settings'] = False
 
 # Handle form submission
 if submit:
-    handle_lookup(username, selected_mode)
+    handle_lookup(username, selected_mode, identicon_only)
 
 # Render Token Settings (only if rate limit hit)
 render_token_settings()
 
 # Display result
-if 'generated_image' in st.session_state and 'user_data' in st.session_state:
+if 'identicon' in st.session_state and 'user_data' in st.session_state:
     user_data = st.session_state['user_data']
-    img = st.session_state['generated_image']
+    identicon = st.session_state['identicon']
     gen_username = st.session_state['generated_username']
     
     # Section 1: Avatar Comparison
-    render_avatar_comparison(user_data, img, gen_username)
-    
-    # Section 2: Account Info
-    render_account_info(user_data)
-    
-    # Section 3: Repositories
-    render_repos_list(user_data)
-    
-    # Section 4: Followers
-    # Note: Currently these are static HTML pills as per request.
-    # If we wanted them clickable, we'd need to refactor render_follow_list to use buttons 
-    # and handle the click here loop.
-    # Section 4: Followers
-    # Note: Currently these are static HTML pills as per request.
-    # If we wanted them clickable, we'd need to refactor render_follow_list to use buttons 
-    # and handle the click here loop.
-    render_follow_list("Followers", user_data.get('followers_list', []), user_data.get('followers', 0), "fl")
-    
-    # Section 5: Following
-    render_follow_list("Following", user_data.get('following_list', []), user_data.get('following', 0), "fw")
+    render_avatar_comparison(user_data, identicon, gen_username)
+    
+    if user_data.get('offline'):
+        # Offline result: only the identicon and its hash are known until the profile arrives
+        enrichment_section(user_data)
+    else:
+        # Section 2: Account Info
+        render_account_info(user_data)
+        
+        # Section 3: Repositories (lists load lazily; the identicon above is already shown)
+        repos_section(user_data)
+        
+        # Section 4: Followers
+        # Note: Currently these are static HTML pills as per request.
+        # If we wanted them clickable, we'd need to refactor render_follow_list to use buttons 
+        # and handle the click here loop.
+        follow_section(user_data, "Followers", 'followers_list', 'followers', "fl")
+        
+        # Section 5: Following
+        follow_section(user_data, "Following", 'following_list', 'following', "fw")
     
     # Section 6: Hash Breakdown
     render_hash_breakdown(user_data)
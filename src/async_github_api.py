@@ -0,0 +1,102 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .github_api import (
+    GitHubClient,
+    get_client,
+    get_api_headers,
+    fetch_user_profile,
+    list_requests,
+    list_flight_key,
+    profile_flight_key,
+    request_flights,
+    _collect_list,
+)
+
+
+class AsyncGitHubClient:
+    """
+    asyncio counterpart to fetch_user_data for resolving many users at once.
+
+    Requests run on a bounded worker pool over a single GitHubClient, so every
+    lookup shares one keep-alive connection pool. Identical concurrent requests,
+    from this client or from threads using github_api, are sent once
+    (see SingleFlight); waiting on them does not occupy a worker.
+
+    Args:
+        client: GitHubClient to share; defaults to the process-wide client. Its
+            pool_maxsize should be at least concurrency so connections are reused
+        concurrency: Maximum number of HTTP requests in flight
+        deadline: Seconds to wait for each user's lists; slower lists come back empty
+    """
+
+    def __init__(self, client: GitHubClient = None, concurrency: int = 16, deadline: float = 10):
+        self.client = client or get_client()
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='github-async')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool; the shared connection pool stays open."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, key, func, *args):
+        return await request_flights.do_async(key, func, *args, executor=self._executor)
+
+    async def fetch_user(self, username: str, token: str = None, search_mode: str = 'auto') -> tuple:
+        """
+        Fetch one user's profile and lists.
+
+        Returns:
+            tuple: (user_data dict or None, error message or None), as fetch_user_data
+        """
+        headers = get_api_headers(token)
+        user_data, error = await self._run(
+            profile_flight_key(username, headers, search_mode, self.client),
+            fetch_user_profile, str(username), headers, search_mode, self.client
+        )
+        if error:
+            return None, error
+        user_data = dict(user_data)
+
+        tasks = {
+            key: asyncio.ensure_future(self._run(
+                list_flight_key(url, headers, transform_func, self.client),
+                _collect_list, url, headers, transform_func, self.client
+            ))
+            for key, (url, transform_func) in list_requests(user_data['login']).items()
+        }
+        done, _ = await asyncio.wait(tasks.values(), timeout=self.deadline)
+        errors = []
+        for key, task in tasks.items():
+            if task in done:
+                items, error = task.result()
+                user_data[key] = list(items)
+            else:
+                task.cancel()
+                user_data[key], error = [], "Request timed out. Please try again."
+            if error:
+                errors.append(error)
+        user_data['lists_error'] = errors[0] if errors else None
+        return user_data, None
+
+    async def fetch_users(self, names_or_ids, token: str = None, search_mode: str = 'auto') -> list:
+        """
+        Resolve many usernames or IDs concurrently.
+
+        Args:
+            names_or_ids: Iterable of GitHub usernames or numeric IDs
+            token: Optional Personal Access Token
+            search_mode: 'auto', 'username', or 'id'
+
+        Returns:
+            list: (user_data dict or None, error message or None) per input, in input order
+        """
+        return await asyncio.gather(*(
+            self.fetch_user(name, token, search_mode) for name in names_or_ids
+        ))
@@ -0,0 +1,234 @@
+import asyncio
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class ByteLRUCache:
+    """
+    Thread-safe LRU cache capped by the total size of its values.
+
+    Args:
+        max_bytes: Upper bound on the summed size of cached values
+        sizeof: Function returning the size of a value (defaults to len)
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, sizeof=len):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value for key (marking it recently used) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a value, evicting least-recently-used entries to stay under max_bytes."""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """Return the cached value for key, building and storing it with factory() on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Snapshot of the cache counters for sizing and monitoring."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for it and receive the same result (or exception). Thread
+    callers use do(), asyncio callers do_async(); both join the same flights.
+    Once a call finishes, the next caller for its key starts a new one.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def _join(self, key) -> tuple:
+        """Return (flight future, True if the caller must run it)."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def _finish(self, key, future):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def _lead(self, key, future, func, args, kwargs):
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future)
+            future.set_exception(e)
+            raise
+        self._finish(key, future)
+        future.set_result(result)
+        return result
+
+    def do(self, key, func, *args, **kwargs):
+        """Run func(*args, **kwargs), or wait for the identical call already in flight."""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        return self._lead(key, future, func, args, kwargs)
+
+    async def do_async(self, key, func, *args, executor=None, **kwargs):
+        """
+        Await func(*args, **kwargs) run on executor, or the identical call already in flight.
+
+        Cancelling one awaiting task never cancels the shared call for the others.
+        """
+        future, leader = self._join(key)
+        if leader:
+            try:
+                job = asyncio.get_running_loop().run_in_executor(
+                    executor, functools.partial(self._lead, key, future, func, args, kwargs)
+                )
+            except BaseException as e:
+                # The job was never scheduled (e.g. the executor is shut down): release the key
+                self._finish(key, future)
+                future.set_exception(e)
+                raise
+            job.add_done_callback(lambda job: self._settle(key, future, job))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _settle(self, key, future, job):
+        """Release waiters of a job that never ran (e.g. its executor shut down)."""
+        if job.cancelled():
+            self._finish(key, future)
+            future.cancel()
+        else:
+            # The outcome was delivered through future; mark the job's own exception as seen
+            job.exception()
+
+
+class TTLCache:
+    """
+    Thread-safe cache of computed results with expiry, a byte ceiling and request coalescing.
+
+    Results of compute functions returning (value, error) are kept for ttl
+    seconds when error is None. Concurrent get_or_compute calls for the same
+    key share a single computation (see SingleFlight) instead of repeating it.
+
+    Args:
+        ttl: Seconds a stored value stays valid
+        max_bytes: Upper bound on the summed (estimated) size of stored values
+        sizeof: Function estimating the size of a value in bytes
+        clock: Monotonic time source
+    """
+
+    def __init__(self, ttl: float = 300, max_bytes: int = 32 * 1024 * 1024, sizeof=len, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = ByteLRUCache(max_bytes, sizeof=lambda entry: sizeof(entry[1]))
+        self._flights = SingleFlight()
+
+    def get(self, key):
+        """Return the unexpired value for key, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return None
+        return entry[1]
+
+    def put(self, key, value, aliases=()):
+        """Store value under key and any alias keys until the TTL runs out."""
+        entry = (self._clock() + self.ttl, value)
+        for name in (key, *aliases):
+            self._entries.put(name, entry)
+
+    def get_or_compute(self, key, compute, aliases=None) -> tuple:
+        """
+        Return (value, error) for key, running compute() at most once at a time per key.
+
+        Args:
+            key: Cache key
+            compute: Callable returning (value, error); only error-free values are stored
+            aliases: Optional callable mapping a computed value to extra keys to store it under
+
+        Returns:
+            tuple: (value, error) from the cache, a concurrent caller's computation, or compute()
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, None
+
+        def compute_and_store():
+            # A flight that finished just before this one started may have stored the value
+            value = self.get(key)
+            if value is not None:
+                return value, None
+            result = compute()
+            value, error = result
+            if error is None and value is not None:
+                self.put(key, value, aliases(value) if aliases else ())
+            return result
+
+        return self._flights.do(key, compute_and_store)
+
+    def clear(self):
+        """Drop every stored value."""
+        self._entries.clear()
+
+    @property
+    def coalesced(self) -> int:
+        """Calls that shared another caller's computation."""
+        return self._flights.shared
+
+    def stats(self) -> dict:
+        """Byte-cache counters plus the number of coalesced calls."""
+        return {**self._entries.stats(), 'ttl': self.ttl, 'coalesced': self.coalesced}
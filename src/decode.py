@@ -0,0 +1,160 @@
+"""
+Identicon image decoding and reverse ID search.
+
+decode_identicon reads the pattern mask and colour back out of an identicon
+image (any size, JPEG-compressed or not); find_candidate_ids sweeps an ID
+range for users whose identicon matches:
+
+    python -m src.decode avatar.png --range 1 200000000
+
+The sweep runs on a process pool in fixed chunks. Each chunk is hashed once
+and filtered on the pattern with a single 64-bit compare per ID; colours are
+only derived for the rare survivors.
+"""
+
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+from .identicon import (
+    pack_identicons,
+    unpack_codes,
+    mask_from_grid,
+    BACKGROUND,
+    DEFAULT_SIZE,
+    DEFAULT_PADDING,
+    PATTERN_BITS
+)
+
+# IDs hashed per worker task
+SCAN_CHUNK = 1 << 21
+# Default per-channel colour tolerance (covers JPEG quantisation and resampling)
+DEFAULT_TOLERANCE = 12
+# Cells closer than this (max channel difference) to the background are always empty
+MIN_CONTRAST = 24
+
+
+def decode_identicon(image: Image.Image) -> tuple:
+    """
+    Recover the pattern mask and foreground colour of an identicon image.
+
+    Each cell is sampled over its central half, mirrored cells are averaged,
+    and cells are classified against the background, so resized and lossy
+    copies decode like the original.
+
+    Args:
+        image: PIL image of a GitHub-style identicon (square, default padding)
+
+    Returns:
+        tuple: (15-bit pattern mask, 0xRRGGBB colour or None when no cell is filled)
+    """
+    pixels = np.asarray(image.convert('RGB'), dtype=np.float64)
+    height, width = pixels.shape[:2]
+
+    # Cell bounds as fractions of the canvas, from the 420px / 35px layout
+    cell = (DEFAULT_SIZE - 2 * DEFAULT_PADDING) // 5 / DEFAULT_SIZE
+    pad = DEFAULT_PADDING / DEFAULT_SIZE
+    samples = np.empty((5, 5, 3))
+    for row in range(5):
+        top = pad + (row + 0.25) * cell
+        y0, y1 = int(top * height), max(int(top * height) + 1, int((top + cell / 2) * height))
+        for col in range(5):
+            left = pad + (col + 0.25) * cell
+            x0, x1 = int(left * width), max(int(left * width) + 1, int((left + cell / 2) * width))
+            samples[row, col] = pixels[y0:y1, x0:x1].reshape(-1, 3).mean(axis=0)
+
+    samples = (samples + samples[:, ::-1]) / 2
+    contrast = np.abs(samples - np.asarray(BACKGROUND)).max(axis=2)
+    if contrast.max() < MIN_CONTRAST:
+        return 0, None
+    filled = contrast > contrast.max() / 2
+
+    r, g, b = np.rint(samples[filled].mean(axis=0)).astype(int)
+    return mask_from_grid(filled), (r << 16) | (g << 8) | b
+
+
+def _pattern_filter(mask: int) -> tuple:
+    """
+    Build (select, expected) so that a digest's first 8 bytes, read as a
+    little-endian uint64 and ANDed with select, equal expected exactly when
+    its pattern nibbles (0-14) produce mask.
+    """
+    select = expected = 0
+    for nibble in range(PATTERN_BITS):
+        # Even nibble <=> its low bit is clear; nibble 2k is the high half of byte k
+        bit = (nibble // 2) * 8 + (4 if nibble % 2 == 0 else 0)
+        select |= 1 << bit
+        if not (mask >> nibble) & 1:
+            expected |= 1 << bit
+    return select, expected
+
+
+def _scan_chunk(start: int, end: int, mask: int, rgb: int, tolerance: int) -> np.ndarray:
+    """IDs in [start, end) whose identicon has mask and a colour within tolerance of rgb."""
+    md5 = hashlib.md5
+    raw = b''.join([md5(str(user_id).encode('utf-8')).digest() for user_id in range(start, end)])
+    prefixes = np.frombuffer(raw, dtype='<u8')[0::2]
+    select, expected = _pattern_filter(mask)
+    ids = np.flatnonzero((prefixes & np.uint64(select)) == np.uint64(expected)) + start
+    if rgb is None or not len(ids):
+        return ids
+
+    _, colors = unpack_codes(pack_identicons(ids.tolist()))
+    target = np.array([(rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF])
+    close = np.abs(colors.astype(np.int64) - target).max(axis=1) <= tolerance
+    return ids[close]
+
+
+def find_candidate_ids(target, start: int, end: int, tolerance: int = DEFAULT_TOLERANCE,
+                       workers: int = None, chunk_size: int = SCAN_CHUNK) -> np.ndarray:
+    """
+    Find the IDs in a range whose identicon matches an image or (mask, rgb) pair.
+
+    Args:
+        target: PIL image, or (mask, rgb) tuple as returned by decode_identicon
+            (rgb None matches the pattern in any colour)
+        start: First ID to scan
+        end: Last ID to scan (inclusive)
+        tolerance: Largest per-channel colour difference still accepted
+        workers: Worker processes (defaults to the CPU count; 1 scans in-process)
+        chunk_size: IDs hashed per task
+
+    Returns:
+        np.ndarray: Sorted int64 candidate IDs
+    """
+    mask, rgb = decode_identicon(target) if isinstance(target, Image.Image) else target
+    bounds = [(low, min(low + chunk_size, end + 1)) for low in range(start, end + 1, chunk_size)]
+
+    if (workers or os.cpu_count() or 1) == 1 or len(bounds) == 1:
+        results = [_scan_chunk(low, high, mask, rgb, tolerance) for low, high in bounds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_scan_chunk, low, high, mask, rgb, tolerance) for low, high in bounds]
+            results = [future.result() for future in futures]
+    return np.concatenate(results) if results else np.empty(0, dtype=np.int64)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find GitHub user IDs whose identicon matches an image.")
+    parser.add_argument('image', help="Identicon image file (PNG, JPEG, ...)")
+    parser.add_argument('--range', nargs=2, type=int, required=True, metavar=('START', 'END'),
+                        help="Scan IDs START..END inclusive")
+    parser.add_argument('--tolerance', type=int, default=DEFAULT_TOLERANCE, help="Per-channel colour tolerance")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    with Image.open(args.image) as image:
+        mask, rgb = decode_identicon(image)
+    color = f"#{rgb:06x}" if rgb is not None else "none"
+    print(f"Decoded pattern 0x{mask:04x}, colour {color}")
+
+    ids = find_candidate_ids((mask, rgb), args.range[0], args.range[1], args.tolerance, args.workers)
+    print(f"{len(ids):,} candidate IDs")
+    for user_id in ids:
+        print(user_id)
+
+
+if __name__ == '__main__':
+    main()
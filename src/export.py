@@ -0,0 +1,336 @@
+"""
+Bulk identicon export.
+
+Renders identicons for an ID range or a file of IDs/logins on a process pool
+and writes them, ordered by ID, as PNG directories, zip or tar shards, or a
+single atlas image:
+
+    python -m src.export --range 1 1000000 --format zip --output out/
+    python -m src.export --input users.txt --format atlas --size 32 --output out/
+
+Work is split into fixed chunks of sorted IDs; every chunk becomes one shard
+(shard-00000.zip, ...) written atomically by whichever worker renders it.
+Finished chunks are recorded in out/checkpoint.json, so an interrupted export
+resumes where it stopped when re-run with the same arguments.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
+from PIL import Image
+from .identicon import (
+    generate_identicons,
+    rasterize_identicons,
+    render_atlas,
+    atlas_layout,
+    atlas_offsets,
+    DEFAULT_SIZE
+)
+from .utils import image_to_bytes
+
+FORMATS = ('png', 'zip', 'tar', 'atlas')
+CHECKPOINT_FILE = 'checkpoint.json'
+ATLAS_RAW_FILE = 'atlas.rgb'
+# Identicons rasterized per batch inside a worker (bounds worker memory)
+RENDER_BATCH = 64
+# Largest atlas accepted, in pixels
+MAX_ATLAS_PIXELS = 1 << 30
+
+
+def read_input_file(path: str, token: str = None) -> list:
+    """Read IDs and logins (one per line); logins are resolved to IDs through the GitHub API."""
+    from .github_api import fetch_user_profile, get_api_headers
+
+    ids, logins = [], []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            value = line.strip()
+            if not value or value.startswith('#'):
+                continue
+            (ids if value.isdigit() else logins).append(value)
+
+    headers = get_api_headers(token)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = pool.map(lambda login: fetch_user_profile(login, headers, 'username'), logins)
+        for login, (user_data, error) in zip(logins, results):
+            if error:
+                print(f"Skipping {login}: {error}", file=sys.stderr)
+            else:
+                ids.append(user_data['id'])
+    return [int(user_id) for user_id in ids]
+
+
+def _render_batches(ids, size: int):
+    """Yield (ids, (N, size, size, 3) pixel buffer) for consecutive batches of IDs."""
+    buffer = np.empty((RENDER_BATCH, size, size, 3), dtype=np.uint8)
+    for start in range(0, len(ids), RENDER_BATCH):
+        batch = ids[start:start + RENDER_BATCH]
+        grids, colors = generate_identicons(batch)
+        yield batch, rasterize_identicons(grids, colors, size, out=buffer[:len(batch)])
+
+
+def _encode_pngs(ids, size: int):
+    """Yield (id, PNG bytes) in ID order."""
+    for batch, pixels in _render_batches(ids, size):
+        for user_id, image_pixels in zip(batch, pixels):
+            image = Image.frombuffer('RGB', (size, size), image_pixels, 'raw', 'RGB', 0, 1)
+            yield user_id, image_to_bytes(image)
+
+
+def _export_chunk(index: int, start: int, ids: list, size: int, fmt: str, output: str, columns: int) -> tuple:
+    """
+    Render one chunk into its shard, or into its tiles of the atlas. Runs in a worker process.
+    
+    Args:
+        index: Chunk number, used for the shard name
+        start: Position of the chunk's first ID in the sorted ID list
+        ids: Sorted IDs of this chunk
+        size: Identicon size in pixels
+        fmt: One of FORMATS
+        output: Output directory
+        columns: Atlas width in tiles (atlas format only)
+        
+    Returns:
+        tuple: (chunk index, number of identicons written)
+    """
+    name = os.path.join(output, f"shard-{index:05d}")
+    
+    if fmt == 'atlas':
+        atlas = np.memmap(os.path.join(output, ATLAS_RAW_FILE), dtype=np.uint8, mode='r+')
+        render_atlas(ids, size, columns=columns, out=atlas.reshape(-1, columns * size, 3), start=start)
+        atlas.flush()
+        return index, len(ids)
+    
+    if fmt == 'png':
+        partial = f"{name}.partial"
+        os.makedirs(partial, exist_ok=True)
+        for user_id, data in _encode_pngs(ids, size):
+            with open(os.path.join(partial, f"{user_id}.png"), 'wb') as f:
+                f.write(data)
+        # A crash between the rename and the checkpoint leaves a finished shard behind
+        shutil.rmtree(name, ignore_errors=True)
+        os.replace(partial, name)
+        return index, len(ids)
+    
+    path = f"{name}.{fmt}"
+    partial = f"{path}.partial"
+    if fmt == 'zip':
+        with zipfile.ZipFile(partial, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for user_id, data in _encode_pngs(ids, size):
+                archive.writestr(f"{user_id}.png", data)
+    else:
+        with tarfile.open(partial, 'w') as archive:
+            for user_id, data in _encode_pngs(ids, size):
+                info = tarfile.TarInfo(f"{user_id}.png")
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+    os.replace(partial, path)
+    return index, len(ids)
+
+
+class _Progress:
+    """Single-line progress meter on stderr."""
+    
+    def __init__(self, total: int, done: int = 0):
+        self.total = total
+        self.done = done
+        self.started = time.monotonic()
+        self.initial = done
+        self._last_draw = 0.0
+    
+    def advance(self, count: int):
+        self.done += count
+        now = time.monotonic()
+        if now - self._last_draw >= 0.2 or self.done >= self.total:
+            self._last_draw = now
+            self.draw(now)
+    
+    def draw(self, now: float = None):
+        now = now or time.monotonic()
+        fraction = self.done / self.total if self.total else 1.0
+        rate = (self.done - self.initial) / max(now - self.started, 1e-9)
+        eta = (self.total - self.done) / rate if rate > 0 else 0
+        bar = '#' * int(fraction * 30)
+        sys.stderr.write(
+            f"\r[{bar:<30}] {self.done:,}/{self.total:,} ({fraction:.1%}) {rate:,.0f} ids/s ETA {eta:,.0f}s"
+        )
+        sys.stderr.flush()
+    
+    def finish(self):
+        self.draw()
+        sys.stderr.write('\n')
+
+
+def _load_checkpoint(output: str, params: dict) -> set:
+    """Return finished chunk indices from a checkpoint written with the same parameters."""
+    path = os.path.join(output, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    if checkpoint.get('params') != params:
+        raise SystemExit(f"{path} was written for different arguments; use a new --output or pass --restart.")
+    return set(checkpoint.get('done', []))
+
+
+def _save_checkpoint(output: str, params: dict, done: set):
+    """Atomically record finished chunks."""
+    path = os.path.join(output, CHECKPOINT_FILE)
+    with open(f"{path}.partial", 'w', encoding='utf-8') as f:
+        json.dump({'params': params, 'done': sorted(done)}, f)
+    os.replace(f"{path}.partial", path)
+
+
+def export_identicons(ids, output: str, fmt: str = 'zip', size: int = DEFAULT_SIZE, workers: int = None,
+                      chunk_size: int = 10000, columns: int = None, restart: bool = False,
+                      progress: bool = True) -> int:
+    """
+    Render identicons for many IDs on a process pool and write them in ID order.
+    
+    Args:
+        ids: Iterable of numeric user IDs; duplicates are dropped and the rest sorted
+        output: Output directory (created if missing)
+        fmt: 'png' (one directory per shard), 'zip', 'tar', or 'atlas' (one image)
+        size: Identicon size in pixels
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: IDs per chunk; each chunk is one shard and one checkpoint step
+        columns: Atlas width in tiles (defaults to a square layout)
+        restart: Ignore an existing checkpoint and start over
+        progress: Show a progress meter on stderr
+        
+    Returns:
+        int: Number of identicons written by this run
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'.")
+    ids = np.unique(np.fromiter((int(user_id) for user_id in ids), dtype=np.int64)).tolist()
+    os.makedirs(output, exist_ok=True)
+    
+    columns, rows = atlas_layout(len(ids), columns)
+    params = {
+        'format': fmt,
+        'size': size,
+        'chunk_size': chunk_size,
+        'columns': columns if fmt == 'atlas' else None,
+        'ids_sha1': hashlib.sha1(np.asarray(ids, dtype=np.int64).tobytes()).hexdigest(),
+        'count': len(ids),
+    }
+    done = set() if restart else _load_checkpoint(output, params)
+    chunk_count = -(-len(ids) // chunk_size)
+    
+    finished = False
+    if fmt == 'atlas':
+        if rows * columns * size * size > MAX_ATLAS_PIXELS:
+            raise ValueError("Atlas would be too large; lower --size or export shards instead.")
+        raw_path = os.path.join(output, ATLAS_RAW_FILE)
+        # A completed atlas has no scratch buffer left to resume from
+        finished = len(done) == chunk_count and all(
+            os.path.exists(os.path.join(output, name)) for name in ('atlas.png', 'atlas.json')
+        )
+        if finished:
+            _remove_atlas_scratch(output)
+        elif restart or not os.path.exists(raw_path):
+            done = set()
+            atlas = np.memmap(raw_path, dtype=np.uint8, mode='w+', shape=(rows * size, columns * size, 3))
+            atlas[...] = 255
+            atlas.flush()
+            del atlas
+    
+    chunks = [
+        (index, start, ids[start:start + chunk_size])
+        for index, start in enumerate(range(0, len(ids), chunk_size))
+    ]
+    pending = [chunk for chunk in chunks if chunk[0] not in done]
+    meter = _Progress(len(ids), len(ids) - sum(len(chunk[2]) for chunk in pending)) if progress else None
+    
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_export_chunk, index, start, chunk_ids, size, fmt, output, columns)
+            for index, start, chunk_ids in pending
+        ]
+        for future in as_completed(futures):
+            index, count = future.result()
+            done.add(index)
+            _save_checkpoint(output, params, done)
+            written += count
+            if meter:
+                meter.advance(count)
+    if meter:
+        meter.finish()
+    
+    if fmt == 'atlas' and not finished:
+        _finish_atlas(output, ids, size, columns, rows)
+    return written
+
+
+def _finish_atlas(output: str, ids: list, size: int, columns: int, rows: int):
+    """
+    Encode the raw atlas buffer to atlas.png, write the atlas.json offset map,
+    then delete the raw buffer. Both files are written atomically, so the
+    buffer is only dropped once the finished atlas is safely in place.
+    """
+    atlas = np.memmap(os.path.join(output, ATLAS_RAW_FILE), dtype=np.uint8, mode='r',
+                      shape=(rows * size, columns * size, 3))
+    path = os.path.join(output, 'atlas.png')
+    Image.frombuffer('RGB', (columns * size, rows * size), atlas, 'raw', 'RGB', 0, 1).save(
+        f"{path}.partial", format='PNG'
+    )
+    del atlas
+    os.replace(f"{path}.partial", path)
+    
+    path = os.path.join(output, 'atlas.json')
+    with open(f"{path}.partial", 'w', encoding='utf-8') as f:
+        json.dump(atlas_offsets(ids, size, columns), f)
+    os.replace(f"{path}.partial", path)
+    _remove_atlas_scratch(output)
+
+
+def _remove_atlas_scratch(output: str):
+    """Delete the raw atlas buffer (up to MAX_ATLAS_PIXELS * 3 bytes) if it is still there."""
+    try:
+        os.remove(os.path.join(output, ATLAS_RAW_FILE))
+    except FileNotFoundError:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-export GitHub identicons.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--range', nargs=2, type=int, metavar=('START', 'END'),
+                        help="Export IDs START..END inclusive")
+    source.add_argument('--input', metavar='FILE', help="File with one ID or login per line")
+    parser.add_argument('--output', required=True, help="Output directory")
+    parser.add_argument('--format', choices=FORMATS, default='zip')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="IDs per shard/checkpoint step")
+    parser.add_argument('--columns', type=int, default=None, help="Atlas width in tiles")
+    parser.add_argument('--token', default=os.environ.get('GITHUB_TOKEN'), help="Token for resolving logins")
+    parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+    parser.add_argument('--quiet', action='store_true', help="No progress meter")
+    args = parser.parse_args(argv)
+    
+    if args.range:
+        ids = range(args.range[0], args.range[1] + 1)
+    else:
+        ids = read_input_file(args.input, args.token)
+    
+    written = export_identicons(
+        ids, args.output, args.format, args.size, args.workers, args.chunk_size,
+        args.columns, args.restart, not args.quiet
+    )
+    print(f"Wrote {written:,} identicons to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,167 @@
+import base64
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .cache import ByteLRUCache, SingleFlight
+from .http_cache import ResponseCache
+from .rate_limit import RateLimiter, RateLimitExceeded
+
+API_URL = "https://api.github.com"
+
+GRAPHQL_URL = f"{API_URL}/graphql"
+
+RATE_LIMIT_ERROR = "Rate limit exceeded. GitHub allows 60 requests per hour for unauthenticated users. Please wait a few minutes and try again."
+
+# Bounded pool shared by all lookups for the follow-up list requests
+_list_executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix='github-list')
+
+# Background profile lookups that enrich offline identicon results
+_lookup_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='github-lookup')
+
+# Background avatar downloads for the avatar comparison
+_avatar_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='github-avatar')
+
+# Seconds a downloaded avatar is served without revalidation, and before a failed one is retried
+AVATAR_TTL = 600
+AVATAR_RETRY = 60
+
+# Downloaded avatars: url -> (etag, content type, bytes, fetched at), bounded by total bytes
+avatar_cache = ByteLRUCache(max_bytes=32 * 1024 * 1024, sizeof=lambda entry: len(entry[2]))
+_avatar_downloads = {}
+_avatar_failures = {}
+_avatar_lock = threading.Lock()
+
+
+# Identical concurrent profile and list requests share one upstream call
+request_flights = SingleFlight()
+
+
+class GitHubClient:
+    """
+    Shared HTTP client for GitHub API and avatar traffic.
+    
+    Owns a keep-alive requests.Session whose connection pool is reused across
+    lookups, with urllib3 retry/backoff for transient server errors.
+    
+    Args:
+        pool_connections: Number of host pools to keep
+        pool_maxsize: Connections kept alive per host
+        retries: Retry attempts for connection errors and 5xx responses
+        backoff_factor: Exponential backoff base between retries, in seconds
+        timeout: Default request timeout in seconds
+        cache: Optional ResponseCache; GETs are then sent as conditional
+            requests and a 304 is answered from the cache
+        rate_limiter: RateLimiter pacing requests per credential; pass None to disable
+    """
+    
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 16, retries: int = 3,
+                 backoff_factor: float = 0.3, timeout: float = 10, cache: ResponseCache = None,
+                 rate_limiter: RateLimiter = ...):
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = RateLimiter() if rate_limiter is ... else rate_limiter
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        """
+        Issue a GET over the pooled session, revalidating against the response cache.
+        
+        Raises:
+            RateLimitExceeded: The credential's budget would not allow the request
+                within the rate limiter's max_wait
+        """
+        timeout = timeout or self.timeout
+        identity = credential_key(headers)
+        entry = None
+        if self.cache is not None and not kwargs.get('stream'):
+            entry = self.cache.get(url, identity)
+            if entry is not None:
+                headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+        
+        response = self._send('GET', url, identity, headers=headers, timeout=timeout, **kwargs)
+        if self.cache is None or kwargs.get('stream'):
+            return response
+        if response.status_code == 304 and entry is not None:
+            return self.cache.revalidated(entry, response)
+        if response.status_code == 200:
+            self.cache.put(url, identity, response)
+        return response
+    
+    def post(self, url, json=None, headers=None, timeout=None, **kwargs):
+        """Issue a POST (e.g. a GraphQL query) over the pooled session; never cached."""
+        return self._send('POST', url, credential_key(headers), json=json, headers=headers,
+                          timeout=timeout or self.timeout, **kwargs)
+    
+    def _send(self, method, url, identity, **kwargs):
+        """Send one request through the rate limiter and feed its headers back."""
+        if self.rate_limiter is None:
+            return self.session.request(method, url, **kwargs)
+        key = (rate_limit_resource(url), identity)
+        headers = kwargs.get('headers') or {}
+        self.rate_limiter.acquire(key, conditional='If-None-Match' in headers or 'If-Modified-Since' in headers)
+        response = self.session.request(method, url, **kwargs)
+        self.rate_limiter.update(key, response)
+        return response
+    
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+def get_client() -> GitHubClient:
+    """Return the process-wide GitHubClient, creating it on first use."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                try:
+                    cache = ResponseCache()
+                except (OSError, sqlite3.Error):
+                    # Read-only or unavailable home directory: run without the disk cache
+                    cache = None
+                _default_client = GitHubClient(cache=cache)
+    return _default_client
+
+def rate_limit_resource(url: str) -> str:
+    """Name of the rate-limit budget a URL draws from (GraphQL is budgeted separately)."""
+    parts = urlsplit(url)
+    if parts.path.rstrip('/').endswith('/graphql'):
+        return f"{parts.netloc}/graphql"
+    return parts.netloc
+
+def rate_limit_remaining(token: str = None, client: GitHubClient = None):
+    """Remaining REST API budget for a token as last reported by GitHub, or None if unknown."""
+    client = client or get_client()
+    if client.rate_limiter is None:
+        return None
+    key = (rate_limit_resource(API_URL), credential_key(get_api_headers(token)))
+    return client.rate_limiter.remaining(key)
+
+def credential_key(headers=None) -> str:
+    """Stable, non-reversible identity of the credential in a set of request headers."""
+    authorization = (headers or {}).get('Authorization')
+    if not authorization:
+        return 'anonymous'
+    return hashlib.sha256(authorization.encode('utf-8')).hexdigest()[:16]
 
 def get_api_headers(token=None):
     """Get headers for GitHub API requests, including token if provided."""
@@ -7,7 +170,9 @@ def get_api_headers(token=None):
         headers['Authorization'] = f"token {token}"
     return headers
 
-def fetch_user_data(username: str, token: str = None, search_mode: str = 'auto') -> tuple:
+def fetch_user_data(username: str, token: str = None, search_mode: str = 'auto', client: GitHubClient = None,
+                    deadline: float = 10, max_items: int = 100, backend: str = 'rest',
+                    include_lists: bool = True, identicon_only: bool = False) -> tuple:
     """
     Fetch user profile, repositories, followers, and following from GitHub.
     
@@ -15,11 +180,184 @@ def fetch_user_data(username: str, token: str = None, search_mode: str = 'auto')
         username: GitHub username or ID
         token: Optional Personal Access Token
         search_mode: 'auto', 'username', or 'id'
+        client: GitHubClient to use; defaults to the shared client
+        deadline: Seconds to wait for the repo/follower/following lists; lists
+            still pending after this come back empty (REST lists then report
+            user_data['lists_error'], as do lists cut short by a failed page)
+        max_items: Cap on each list, fetched page by page (None for all)
+        backend: 'rest' (four REST calls), 'graphql' (one POST, requires a token),
+            or 'auto' (GraphQL when a token is given)
+        include_lists: Set False to stop after the REST profile call and load the
+            lists later (GraphQL always includes them in its single request)
+        identicon_only: For numeric IDs, skip the network and return
+            offline_user_data; usernames still need one profile call
         
     Returns:
         tuple: (user_data dict or None, error message or None)
     """
+    # ASCII digits only: str.isdigit() also accepts characters like '²' that int() rejects
+    if identicon_only and search_mode != 'username' and str(username).isascii() and str(username).isdecimal():
+        return offline_user_data(username), None
+    
+    client = client or get_client()
+    use_graphql = backend == 'graphql' or (backend == 'auto' and bool(token))
+    # Concurrent callers share one lookup (a follower gets the leader's deadline);
+    # each receives its own copy to modify
+    key = ('user', search_mode, str(username).lower(), credential_key(get_api_headers(token)),
+           use_graphql, include_lists or use_graphql, max_items, id(client))
+    user_data, error = request_flights.do(
+        key, _fetch_user_data, username, token, search_mode, client, deadline, max_items, use_graphql, include_lists
+    )
+    return (dict(user_data) if user_data is not None else None), error
+
+def _fetch_user_data(username, token, search_mode, client, deadline, max_items, use_graphql, include_lists) -> tuple:
+    """Uncoalesced body of fetch_user_data."""
+    if use_graphql:
+        user_data, error = fetch_user_data_graphql(username, token, search_mode, client, max_items)
+        if error != not_found_error(username):
+            return user_data, error
+        # GraphQL's user lookups only resolve user accounts; organizations are found over REST
+    
     headers = get_api_headers(token)
+    
+    user_data, error = _fetch_profile(username, headers, search_mode, client)
+    if error:
+        return None, error
+    if not include_lists:
+        return user_data, None
+
+    # Fetch additional lists
+    # Use the resolved username (login) just in case the input was an ID
+    search_username = user_data.get('login', username)
+    user_data.update(fetch_user_lists(search_username, headers, client, deadline, max_items))
+    
+    return user_data, None
+
+def offline_user_data(user_id) -> dict:
+    """
+    Build user_data for a numeric ID without touching the network.
+    
+    Only 'id' is known; profile fields are empty and 'offline' is True until
+    the result is enriched (see fetch_user_data_async).
+    """
+    return {
+        'id': str(int(user_id)),
+        'login': None,
+        'created_at': None,
+        'avatar_url': None,
+        'public_repos': 0,
+        'followers': 0,
+        'following': 0,
+        'name': None,
+        'bio': None,
+        'offline': True,
+    }
+
+def fetch_user_data_async(username: str, token: str = None, search_mode: str = 'auto', **kwargs):
+    """
+    Run fetch_user_data on a background pool, e.g. to enrich an offline result.
+    
+    Returns:
+        concurrent.futures.Future: resolves to fetch_user_data's (user_data, error) tuple
+    """
+    return _lookup_executor.submit(fetch_user_data, username, token, search_mode, **kwargs)
+
+def fetch_avatar(url: str, client: GitHubClient = None, timeout: float = 5) -> tuple:
+    """
+    Download an avatar into avatar_cache, revalidating a cached copy by its ETag.
+    
+    Args:
+        url: Avatar URL (user_data['avatar_url'])
+        client: GitHubClient whose pooled session is used; defaults to the shared client
+        timeout: Request timeout in seconds
+        
+    Returns:
+        tuple: (image bytes or None, content type or None, error message or None)
+    """
+    client = client or get_client()
+    entry = avatar_cache.get(url)
+    headers = {'If-None-Match': entry[0]} if entry and entry[0] else None
+    
+    try:
+        # Avatars bypass the API response cache and rate limiter: they are not API
+        # calls, and their bodies would only be stored twice
+        response = client.session.get(url, headers=headers, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return None, None, f"Avatar download failed: {e}"
+    
+    if response.status_code == 304 and entry is not None:
+        entry = (entry[0], entry[1], entry[2], time.time())
+    elif response.status_code == 200:
+        entry = (
+            response.headers.get('ETag'),
+            response.headers.get('Content-Type', 'image/png'),
+            response.content,
+            time.time()
+        )
+    else:
+        return None, None, f"Avatar download failed (HTTP {response.status_code})"
+    
+    avatar_cache.put(url, entry)
+    return entry[2], entry[1], None
+
+def _download_avatar(url: str, client: GitHubClient = None):
+    content, content_type, error = None, None, "Avatar download failed"
+    try:
+        content, content_type, error = fetch_avatar(url, client)
+    finally:
+        with _avatar_lock:
+            _avatar_downloads.pop(url, None)
+            if error:
+                _avatar_failures[url] = (error, time.time())
+            else:
+                _avatar_failures.pop(url, None)
+
+def get_avatar(url: str, client: GitHubClient = None) -> tuple:
+    """
+    Return a cached avatar without blocking, downloading it in the background when needed.
+    
+    Fresh copies come straight from avatar_cache; stale ones are returned while
+    a conditional request refreshes them, and missing ones are scheduled once
+    however often this is called (e.g. on every Streamlit rerun).
+    
+    Returns:
+        tuple: (image bytes or None, content type or None, error message or None);
+            (None, None, None) means the download is still in progress
+    """
+    entry = avatar_cache.get(url)
+    now = time.time()
+    if entry is not None and now - entry[3] < AVATAR_TTL:
+        return entry[2], entry[1], None
+    
+    with _avatar_lock:
+        failure = _avatar_failures.get(url)
+        if entry is None and failure is not None and now - failure[1] < AVATAR_RETRY:
+            return None, None, failure[0]
+        if url not in _avatar_downloads:
+            _avatar_downloads[url] = _avatar_executor.submit(_download_avatar, url, client)
+    
+    if entry is not None:
+        return entry[2], entry[1], None
+    return None, None, None
+
+def not_found_error(username) -> str:
+    """Error message for a login or ID that GitHub does not know."""
+    return f"User '{username}' not found on GitHub. Please check the username and try again."
+
+def fetch_user_profile(username: str, headers: dict, search_mode: str = 'auto', client: GitHubClient = None) -> tuple:
+    """
+    Fetch only the user profile with a single API call.
+    
+    Args:
+        username: GitHub username or ID
+        headers: API headers from get_api_headers
+        search_mode: 'auto', 'username', or 'id'
+        client: GitHubClient to use; defaults to the shared client
+        
+    Returns:
+        tuple: (user_data dict without lists or None, error message or None)
+    """
+    client = client or get_client()
     user_data = {}
     
     try:
@@ -29,16 +367,16 @@ def fetch_user_data(username: str, token: str = None, search_mode: str = 'auto')
         if search_mode == 'id':
             if not is_numeric:
                 return None, "Search mode is 'ID' but input is not a number."
-            url = f"https://api.github.com/user/{username}"
+            url = f"{API_URL}/user/{username}"
         elif search_mode == 'username':
-            url = f"https://api.github.com/users/{username}"
+            url = f"{API_URL}/users/{username}"
         else: # auto
             if is_numeric:
-                url = f"https://api.github.com/user/{username}"
+                url = f"{API_URL}/user/{username}"
             else:
-                url = f"https://api.github.com/users/{username}"
+                url = f"{API_URL}/users/{username}"
             
-        response = requests.get(url, headers=headers, timeout=10)
+        response = client.get(url, headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -56,39 +394,401 @@ def fetch_user_data(username: str, token: str = None, search_mode: str = 'auto')
                 'bio': data.get('bio'),
             }
         elif response.status_code == 404:
-            return None, f"User '{username}' not found on GitHub. Please check the username and try again."
-        elif response.status_code == 403:
-            return None, "Rate limit exceeded. GitHub allows 60 requests per hour for unauthenticated users. Please wait a few minutes and try again."
+            return None, not_found_error(username)
+        elif response.status_code in (403, 429):
+            return None, RATE_LIMIT_ERROR
         elif response.status_code == 401:
             return None, "Authentication required. The GitHub API request was not authorized."
         else:
             return None, f"Unable to fetch user data. GitHub responded with status code {response.status_code}."
             
+    except RateLimitExceeded:
+        return None, RATE_LIMIT_ERROR
     except requests.exceptions.Timeout:
         return None, "Request timed out. Please try again."
     except requests.exceptions.RequestException as e:
         return None, f"Network error: {str(e)}"
+    
+    return user_data, None
 
-    # Fetch additional lists
-    # Use the resolved username (login) just in case the input was an ID
-    search_username = user_data.get('login', username)
+def profile_flight_key(username, headers, search_mode: str = 'auto', client: GitHubClient = None) -> tuple:
+    """request_flights key of a REST profile call, shared by thread and asyncio callers."""
+    return ('profile', search_mode, str(username).lower(), credential_key(headers), id(client or get_client()))
+
+def _fetch_profile(username, headers: dict, search_mode: str = 'auto', client: GitHubClient = None) -> tuple:
+    """fetch_user_profile, sharing the call with identical concurrent lookups; returns a copy to modify."""
+    key = profile_flight_key(username, headers, search_mode, client)
+    user_data, error = request_flights.do(key, fetch_user_profile, str(username), headers, search_mode, client)
+    return (dict(user_data) if user_data is not None else None), error
+
+_GRAPHQL_CONNECTIONS = {
+    'repos_list': (
+        'repositories',
+        'privacy: PUBLIC, ownerAffiliations: OWNER, orderBy: {field: UPDATED_AT, direction: DESC}',
+        'name description stargazerCount primaryLanguage { name }',
+    ),
+    'followers_list': ('followers', '', 'login'),
+    'following_list': ('following', '', 'login'),
+}
+
+def _graphql_connection(key: str, cursor_var: str = None) -> str:
+    """GraphQL selection for one list connection, optionally continuing after a cursor variable."""
+    field, args, node_fields = _GRAPHQL_CONNECTIONS[key]
+    arguments = ', '.join(x for x in ['first: $first', f'after: ${cursor_var}' if cursor_var else '', args] if x)
+    return f'{field}({arguments}) {{ totalCount pageInfo {{ hasNextPage endCursor }} nodes {{ {node_fields} }} }}'
+
+def _graphql_user_query(search_mode: str, username: str) -> tuple:
+    """Build the single-round-trip profile query and its variables."""
+    connections = ' '.join(_graphql_connection(key) for key in _GRAPHQL_CONNECTIONS)
+    fields = f'databaseId login createdAt avatarUrl name bio {connections}'
     
-    # Increase per_page to 100 to show more items
-    user_data['repos_list'] = _fetch_list(f"https://api.github.com/users/{search_username}/repos?per_page=100&sort=updated", headers, transform_repo)
-    user_data['followers_list'] = _fetch_list(f"https://api.github.com/users/{search_username}/followers?per_page=100", headers, lambda x: x['login'])
-    user_data['following_list'] = _fetch_list(f"https://api.github.com/users/{search_username}/following?per_page=100", headers, lambda x: x['login'])
+    is_numeric = str(username).isdigit()
+    if search_mode == 'id' or (search_mode == 'auto' and is_numeric):
+        # GraphQL has no lookup by numeric ID; the legacy global node ID encodes it
+        node_id = base64.b64encode(f"04:User{username}".encode('utf-8')).decode('ascii')
+        return f'query($id: ID!, $first: Int!) {{ user: node(id: $id) {{ ... on User {{ {fields} }} }} }}', {'id': node_id}
+    return f'query($login: String!, $first: Int!) {{ user(login: $login) {{ {fields} }} }}', {'login': str(username)}
+
+def _graphql_post(query: str, variables: dict, headers: dict, client: GitHubClient) -> tuple:
+    """Run a GraphQL query, mapping HTTP and GraphQL failures onto error messages."""
+    try:
+        response = client.post(GRAPHQL_URL, json={'query': query, 'variables': variables}, headers=headers)
+    except RateLimitExceeded:
+        return None, RATE_LIMIT_ERROR
+    except requests.exceptions.Timeout:
+        return None, "Request timed out. Please try again."
+    except requests.exceptions.RequestException as e:
+        return None, f"Network error: {str(e)}"
+    
+    if response.status_code in (403, 429):
+        return None, RATE_LIMIT_ERROR
+    if response.status_code == 401:
+        return None, "Authentication required. The GitHub API request was not authorized."
+    if response.status_code != 200:
+        return None, f"Unable to fetch user data. GitHub responded with status code {response.status_code}."
+    
+    payload = response.json()
+    errors = payload.get('errors') or []
+    if any(error.get('type') == 'RATE_LIMITED' for error in errors):
+        return None, RATE_LIMIT_ERROR
+    data = payload.get('data') or {}
+    if errors and not data.get('user'):
+        if any(error.get('type') == 'NOT_FOUND' for error in errors):
+            return {}, None
+        return None, f"Unable to fetch user data. GitHub GraphQL error: {errors[0].get('message')}"
+    return data, None
+
+def fetch_user_data_graphql(username: str, token: str, search_mode: str = 'auto', client: GitHubClient = None,
+                            max_items: int = 100) -> tuple:
+    """
+    Fetch the same user_data as fetch_user_data with a single GraphQL POST.
+    
+    Lists longer than one page (100 items) are continued with cursor-based
+    follow-up queries that advance every unfinished list at once; if one of
+    them fails, the lists keep the pages fetched so far and lists_error is set.
+    Only user accounts resolve here (fetch_user_data falls back to REST for
+    organizations).
+    
+    Args:
+        username: GitHub username or ID
+        token: Personal Access Token (GraphQL does not allow anonymous access)
+        search_mode: 'auto', 'username', or 'id'
+        client: GitHubClient to use; defaults to the shared client
+        max_items: Cap on each list (None for all)
+        
+    Returns:
+        tuple: (user_data dict or None, error message or None)
+    """
+    if not token:
+        return None, "GraphQL lookups require a GitHub token."
+    if search_mode == 'id' and not str(username).isdigit():
+        return None, "Search mode is 'ID' but input is not a number."
+    
+    client = client or get_client()
+    headers = get_api_headers(token)
+    page_size = 100 if max_items is None else max(1, min(100, max_items))
+    
+    query, variables = _graphql_user_query(search_mode, username)
+    data, error = _graphql_post(query, {**variables, 'first': page_size}, headers, client)
+    if error:
+        return None, error
+    user = data.get('user')
+    if not user:
+        return None, not_found_error(username)
+    
+    user_data = {
+        'id': str(user['databaseId']),
+        'login': user['login'],
+        'created_at': user.get('createdAt'),
+        'avatar_url': user.get('avatarUrl'),
+        'public_repos': user['repositories']['totalCount'],
+        'followers': user['followers']['totalCount'],
+        'following': user['following']['totalCount'],
+        'name': user.get('name'),
+        'bio': user.get('bio'),
+    }
+    
+    transforms = {'repos_list': transform_graphql_repo, 'followers_list': transform_login, 'following_list': transform_login}
+    user_data['lists_error'] = None
+    cursors = {}
+    for key, (field, _, _) in _GRAPHQL_CONNECTIONS.items():
+        connection = user[field]
+        user_data[key] = [transforms[key](node) for node in connection['nodes']][:max_items]
+        if connection['pageInfo']['hasNextPage']:
+            cursors[key] = connection['pageInfo']['endCursor']
+    
+    # Continue every list that still has pages, in one query per round
+    while True:
+        cursors = {key: cursor for key, cursor in cursors.items()
+                   if max_items is None or len(user_data[key]) < max_items}
+        if not cursors:
+            break
+        declarations = ''.join(f', ${key}: String' for key in cursors)
+        selections = ' '.join(_graphql_connection(key, key) for key in cursors)
+        query = f'query($login: String!, $first: Int!{declarations}) {{ user(login: $login) {{ {selections} }} }}'
+        data, error = _graphql_post(query, {'login': user_data['login'], 'first': page_size, **cursors}, headers, client)
+        if error or not data.get('user'):
+            # Keep the pages already fetched, but mark the lists as cut short
+            user_data['lists_error'] = error or not_found_error(user_data['login'])
+            break
+        
+        for key in list(cursors):
+            connection = data['user'][_GRAPHQL_CONNECTIONS[key][0]]
+            user_data[key].extend(transforms[key](node) for node in connection['nodes'])
+            if max_items is not None:
+                del user_data[key][max_items:]
+            if connection['pageInfo']['hasNextPage']:
+                cursors[key] = connection['pageInfo']['endCursor']
+            else:
+                del cursors[key]
     
     return user_data, None
 
-def _fetch_list(url, headers, transform_func):
-    """Helper to fetch a list of items and transform them."""
+# Items per request on list endpoints (GitHub's maximum)
+LIST_PAGE_SIZE = 100
+
+def list_requests(login: str) -> dict:
+    """Map each list key in user_data to its (url, transform_func) pair."""
+    # Increase per_page to 100 to show more items
+    return {
+        'repos_list': (f"{API_URL}/users/{login}/repos?per_page={LIST_PAGE_SIZE}&sort=updated", transform_repo),
+        'followers_list': (f"{API_URL}/users/{login}/followers?per_page={LIST_PAGE_SIZE}", transform_login),
+        'following_list': (f"{API_URL}/users/{login}/following?per_page={LIST_PAGE_SIZE}", transform_login),
+    }
+
+def _page_url(url: str, page: int) -> str:
+    """Return url with its page query parameter set."""
+    parts = urlsplit(url)
+    query = [(name, value) for name, value in parse_qsl(parts.query) if name != 'page']
+    if page > 1:
+        query.append(('page', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ListCursor:
+    """
+    Incremental cursor into a paginated GitHub list endpoint.
+    
+    Pages are requested only when a caller asks for items beyond those already
+    fetched, following the Link rel="next" header. A failed page leaves the
+    cursor where it was (see error) so it can be retried. Thread-safe.
+    
+    Args:
+        url: First page URL (with per_page=page_size)
+        headers: API headers from get_api_headers
+        transform_func: Applied to every raw item
+        client: GitHubClient to use; defaults to the shared client
+        items: Leading items already fetched (e.g. the first page from
+            prefetch_user_lists); the cursor continues after them
+        page_size: per_page of url
+    """
+    
+    def __init__(self, url: str, headers: dict, transform_func, client: GitHubClient = None,
+                 items: list = None, page_size: int = LIST_PAGE_SIZE):
+        self.headers = headers
+        self.transform_func = transform_func
+        self.client = client or get_client()
+        self.items = list(items or [])
+        self.error = None
+        # A short final page means the list is complete
+        complete = len(self.items) % page_size != 0
+        self.next_url = None if complete else _page_url(url, len(self.items) // page_size + 1)
+        self._lock = threading.Lock()
+        self._pending = None
+    
+    @property
+    def exhausted(self) -> bool:
+        """Whether every item of the list has been fetched."""
+        return self.next_url is None
+    
+    def fetch_until(self, count: int) -> list:
+        """Fetch pages until at least count items are loaded or the list ends; returns all loaded items."""
+        with self._lock:
+            while len(self.items) < count and self.next_url:
+                try:
+                    response = self.client.get(self.next_url, headers=self.headers)
+                except requests.exceptions.RequestException as e:
+                    self.error = RATE_LIMIT_ERROR if isinstance(e, RateLimitExceeded) else f"Network error: {e}"
+                    break
+                if response.status_code != 200:
+                    self.error = RATE_LIMIT_ERROR if response.status_code in (403, 429) else f"GitHub API error: {response.status_code}"
+                    break
+                
+                page = response.json()
+                self.items.extend(self.transform_func(item) for item in page)
+                self.next_url = response.links.get('next', {}).get('url') if page else None
+                self.error = None
+            return self.items
+    
+    def prefetch(self, count: int):
+        """
+        Fetch up to count items on the background list pool, e.g. the page after the visible one.
+        
+        Returns:
+            concurrent.futures.Future or None if nothing needs fetching
+        """
+        if len(self.items) >= count or self.exhausted:
+            return None
+        pending = self._pending
+        if pending is None or pending.done():
+            pending = self._pending = _list_executor.submit(self.fetch_until, count)
+        return pending
+
+def list_cursor(login: str, key: str, headers: dict, client: GitHubClient = None, items: list = None) -> ListCursor:
+    """ListCursor over one of a user's lists (a list_requests key), continuing after items."""
+    url, transform_func = list_requests(login)[key]
+    return ListCursor(url, headers, transform_func, client, items)
+
+def prefetch_user_lists(login: str, headers: dict, client: GitHubClient = None, max_items: int = 100) -> dict:
+    """
+    Start fetching the repos, followers, and following lists in the background.
+    
+    Returns:
+        dict: concurrent.futures.Future per list key, each resolving to
+            (list, error message or None), as _fetch_list
+    """
+    client = client or get_client()
+    return {
+        key: _list_executor.submit(_fetch_list, url, headers, transform_func, client, max_items)
+        for key, (url, transform_func) in list_requests(login).items()
+    }
+
+def fetch_user_lists(login: str, headers: dict, client: GitHubClient = None, deadline: float = 10,
+                     max_items: int = 100) -> dict:
+    """
+    Fetch the repos, followers, and following lists concurrently.
+    
+    Args:
+        login: Resolved GitHub username
+        headers: API headers from get_api_headers
+        client: GitHubClient to use; defaults to the shared client
+        deadline: Seconds to wait overall; slower lists come back empty
+        max_items: Cap on each list (None for all pages)
+        
+    Returns:
+        dict: repos_list, followers_list and following_list, plus lists_error
+            (the first error, or None) when any list is incomplete or timed out
+    """
+    futures = prefetch_user_lists(login, headers, client, max_items)
+    done, _ = wait(futures.values(), timeout=deadline)
+    
+    lists = {}
+    errors = []
+    for key, future in futures.items():
+        if future in done:
+            lists[key], error = future.result()
+        else:
+            future.cancel()
+            lists[key], error = [], "Request timed out. Please try again."
+        if error:
+            errors.append(error)
+    lists['lists_error'] = errors[0] if errors else None
+    return lists
+
+def iter_pages(url: str, headers: dict, transform_func, client: GitHubClient = None,
+               max_items: int = None, prefetch: bool = False):
+    """
+    Walk a paginated list endpoint, yielding each page as it arrives.
+    
+    Pages are followed through the Link rel="next" header, so memory use stays
+    at one or two pages no matter how long the list is.
+    
+    Args:
+        url: First page URL
+        headers: API headers from get_api_headers
+        transform_func: Applied to every raw item
+        client: GitHubClient to use; defaults to the shared client
+        max_items: Stop after this many items (None for all)
+        prefetch: Request the next page while the caller consumes the current one
+        
+    Yields:
+        list: Transformed items of one page
+    
+    Raises:
+        requests.exceptions.RequestException: A page failed (HTTPError carries the
+            non-200 response), so a walk cut short never looks like a complete list
+    """
+    client = client or get_client()
+    remaining = max_items
+    pending = None
+    
+    while url and (remaining is None or remaining > 0):
+        response = pending.result() if pending is not None else client.get(url, headers=headers)
+        pending = None
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(f"GitHub API error: {response.status_code}", response=response)
+        
+        items = response.json()
+        if remaining is not None:
+            items = items[:remaining]
+            remaining -= len(items)
+        url = response.links.get('next', {}).get('url')
+        
+        if prefetch and url and (remaining is None or remaining > 0):
+            pending = _list_executor.submit(client.get, url, headers=headers)
+        yield [transform_func(item) for item in items]
+
+def iter_items(url: str, headers: dict, transform_func, client: GitHubClient = None,
+               max_items: int = None, prefetch: bool = False):
+    """Flatten iter_pages into a stream of individual items."""
+    for page in iter_pages(url, headers, transform_func, client, max_items, prefetch):
+        yield from page
+
+def list_flight_key(url, headers, transform_func, client=None, max_items=100) -> tuple:
+    """request_flights key of a list fetch, shared by thread and asyncio callers."""
+    return ('list', url, credential_key(headers), transform_func, max_items, id(client or get_client()))
+
+def _fetch_list(url, headers, transform_func, client=None, max_items=100) -> tuple:
+    """
+    Helper to fetch a list of items and transform them; concurrent identical fetches share one.
+    
+    Returns:
+        tuple: (list of items, error message or None if the list is complete)
+    """
+    key = list_flight_key(url, headers, transform_func, client, max_items)
+    items, error = request_flights.do(key, _collect_list, url, headers, transform_func, client, max_items)
+    return list(items), error
+
+def _collect_list(url, headers, transform_func, client=None, max_items=100) -> tuple:
+    """Fetch every page of a list into one list; on failure, the pages that succeeded and the error."""
+    items = []
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            return [transform_func(item) for item in response.json()]
-    except:
-        pass
-    return []
+        for page in iter_pages(url, headers, transform_func, client, max_items):
+            items.extend(page)
+    except requests.exceptions.RequestException as e:
+        return items, _list_error(e)
+    return items, None
+
+def _list_error(e: requests.exceptions.RequestException) -> str:
+    """User-facing message for a failed list page, worded like fetch_user_profile and ListCursor errors."""
+    status = e.response.status_code if e.response is not None else None
+    if isinstance(e, RateLimitExceeded) or status in (403, 429):
+        return RATE_LIMIT_ERROR
+    if status is not None:
+        return f"GitHub API error: {status}"
+    if isinstance(e, requests.exceptions.Timeout):
+        return "Request timed out. Please try again."
+    return f"Network error: {str(e)}"
 
 def transform_repo(repo):
     """Transform raw repo data into our simplified format."""
@@ -98,3 +798,17 @@ def transform_repo(repo):
         'stars': repo.get('stargazers_count', 0), 
         'language': repo.get('language', '')
     }
+
+
+def transform_login(user):
+    """Reduce a follower/following entry to its login."""
+    return user['login']
+
+def transform_graphql_repo(repo):
+    """Transform a GraphQL repository node into the transform_repo format."""
+    return {
+        'name': repo['name'],
+        'description': repo.get('description'),
+        'stars': repo.get('stargazerCount', 0),
+        'language': (repo.get('primaryLanguage') or {}).get('name')
+    }
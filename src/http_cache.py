@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'github-identicon-lookup', 'responses.sqlite3')
+
+# Hop-by-hop and body-describing headers of a 304 that must not replace the cached ones
+_BODY_HEADERS = {'content-length', 'content-encoding', 'content-type', 'transfer-encoding'}
+
+
+class ResponseCache:
+    """
+    On-disk cache of GET response bodies and their validators (ETag / Last-Modified).
+
+    Entries are keyed by URL and credential identity so responses fetched with
+    one token are never served to another. The SQLite file is safe to share
+    between threads and processes.
+
+    Args:
+        path: SQLite database file; parent directories are created
+        max_entries: Oldest entries beyond this count are pruned
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_entries: int = 20000):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' url TEXT NOT NULL, identity TEXT NOT NULL,'
+                ' etag TEXT, last_modified TEXT, headers TEXT NOT NULL, body BLOB NOT NULL,'
+                ' stored_at REAL NOT NULL, PRIMARY KEY (url, identity))'
+            )
+
+    def get(self, url: str, identity: str):
+        """Return the cached entry as a dict (etag, last_modified, headers, body) or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, headers, body FROM responses WHERE url = ? AND identity = ?',
+                (url, identity)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'etag': row[0], 'last_modified': row[1], 'headers': json.loads(row[2]), 'body': row[3]}
+
+    def put(self, url: str, identity: str, response: requests.Response):
+        """Store a full 200 response if it carries a validator."""
+        self.misses += 1
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, identity, etag, last_modified, json.dumps(dict(response.headers)), response.content, time.time())
+            )
+            self._writes += 1
+            if self._writes % 500 == 0:
+                self._conn.execute(
+                    'DELETE FROM responses WHERE rowid IN ('
+                    ' SELECT rowid FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,)
+                )
+
+    def conditional_headers(self, entry: dict) -> dict:
+        """Request headers that revalidate a cached entry."""
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, entry: dict, not_modified: requests.Response) -> requests.Response:
+        """Build a 200 response from a cached entry and the 304 that confirmed it."""
+        headers = CaseInsensitiveDict(entry['headers'])
+        for name, value in not_modified.headers.items():
+            if name.lower() not in _BODY_HEADERS:
+                headers[name] = value
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = entry['body']
+        response.headers = headers
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.from_cache = True
+        self.hits += 1
+        return response
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM responses')
+
+    def stats(self) -> dict:
+        """Revalidation counters: hits are 304s served from the cache, misses full 200 bodies."""
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses}
@@ -1,83 +1,592 @@
 import hashlib
 import colorsys
+from functools import lru_cache
 import numpy as np
 from PIL import Image, ImageDraw
+from .cache import ByteLRUCache
+from .utils import image_to_bytes
 
-def generate_identicon_from_id(user_id: str) -> tuple:
+# colorsys.hls_to_rgb constants, repeated here so the vectorized path rounds identically
+ONE_THIRD = 1.0 / 3.0
+ONE_SIXTH = 1.0 / 6.0
+TWO_THIRD = 2.0 / 3.0
+
+# Source block (center, second, outer) feeding each of the five grid columns
+COLUMN_BLOCKS = [2, 1, 0, 1, 2]
+
+BACKGROUND = (240, 240, 240)
+DEFAULT_SIZE = 420
+DEFAULT_PADDING = 35
+# Packed identicon code: 15-bit pattern mask above the 28-bit HLS segment
+# (12-bit hue, 8-bit saturation, 8-bit lightness), 43 bits in all
+PATTERN_BITS = 15
+HLS_BITS = 28
+# Tiles rasterized per step when packing an atlas
+ATLAS_BATCH = 64
+
+# Process-wide cache of encoded identicons keyed by (user_id, size, format)
+identicon_cache = ByteLRUCache(max_bytes=64 * 1024 * 1024)
+
+class Identicon:
+    """
+    Compact, immutable description of a user's identicon.
+    
+    Only the hash, the 15-bit pattern mask and the packed RGB colour are kept;
+    pixels, PNG bytes and SVG markup are built on demand.
+    
+    Attributes:
+        user_id: The GitHub user ID as a string
+        md5_hash: Hex MD5 digest of the user ID
+        mask: 15-bit pattern mask; bit i is set when pattern nibble i is even
+        rgb: Foreground colour packed as 0xRRGGBB
+    
+    The whole identicon is also expressible as a 43-bit code (see `code`);
+    two IDs render identically exactly when their (mask, rgb) pairs match.
+    """
+    __slots__ = ('user_id', 'md5_hash', 'mask', 'rgb')
+    
+    def __init__(self, user_id, md5_hash: str, mask: int, rgb: int):
+        object.__setattr__(self, 'user_id', str(user_id))
+        object.__setattr__(self, 'md5_hash', md5_hash)
+        object.__setattr__(self, 'mask', mask)
+        object.__setattr__(self, 'rgb', rgb)
+    
+    @classmethod
+    def from_id(cls, user_id) -> 'Identicon':
+        """Hash a user ID and derive its pattern mask and colour."""
+        hex_hash = hashlib.md5(str(user_id).encode('utf-8')).hexdigest()
+        
+        hue = int(hex_hash[-7:-4], 16) / 4095.0
+        saturation = 0.65 - (int(hex_hash[-4:-2], 16) / 255.0) * 0.20
+        lightness = 0.75 - (int(hex_hash[-2:], 16) / 255.0) * 0.20
+        r, g, b = colorsys.hls_to_rgb(hue, lightness, saturation)
+        rgb = (int(r * 255) << 16) | (int(g * 255) << 8) | int(b * 255)
+        
+        mask = 0
+        for i, char in enumerate(hex_hash[:15]):
+            if int(char, 16) % 2 == 0:
+                mask |= 1 << i
+        
+        return cls(user_id, hex_hash, mask, rgb)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __reduce__(self):
+        # Rebuild through __init__, so pickle / copy never go through the blocked __setattr__
+        return (type(self), (self.user_id, self.md5_hash, self.mask, self.rgb))
+    
+    def __eq__(self, other):
+        if not isinstance(other, Identicon):
+            return NotImplemented
+        return self.md5_hash == other.md5_hash
+    
+    def __hash__(self):
+        return hash(self.md5_hash)
+    
+    def __repr__(self):
+        return f"Identicon(user_id={self.user_id!r}, mask=0x{self.mask:04x}, rgb=#{self.rgb:06x})"
+    
+    @property
+    def color(self) -> tuple:
+        """Foreground colour as an (r, g, b) tuple."""
+        return ((self.rgb >> 16) & 0xFF, (self.rgb >> 8) & 0xFF, self.rgb & 0xFF)
+    
+    @property
+    def color_hex(self) -> str:
+        """Foreground colour as a #rrggbb string."""
+        return f"#{self.rgb:06x}"
+    
+    @property
+    def code(self) -> int:
+        """Packed 43-bit code: pattern mask << 28 | hue << 16 | saturation << 8 | lightness."""
+        return (self.mask << HLS_BITS) | int(self.md5_hash[-7:], 16)
+    
+    @property
+    def grid(self) -> np.ndarray:
+        """The mirrored 5x5 boolean grid."""
+        return grids_from_masks(self.mask)[0]
+    
+    def metadata(self) -> dict:
+        """Hash breakdown in the shape returned by generate_identicon_from_id."""
+        return {
+            'md5_hash': self.md5_hash,
+            'hue_segment': self.md5_hash[-7:-4],
+            'sat_segment': self.md5_hash[-4:-2],
+            'lig_segment': self.md5_hash[-2:],
+            'color_rgb': self.color,
+            'color_hex': self.color_hex,
+            'pattern_segment': self.md5_hash[:15],
+        }
+    
+    def to_image(self, size: int = DEFAULT_SIZE, padding: int = None) -> Image.Image:
+        """Render the identicon to a PIL image."""
+        return render_identicon(self.grid, self.color, size, padding)
+    
+    def to_png(self, size: int = DEFAULT_SIZE, padding: int = None) -> bytes:
+        """Render the identicon and encode it as PNG bytes."""
+        return image_to_bytes(self.to_image(size, padding))
+    
+    def is_filled(self, row: int, col: int) -> bool:
+        """Whether grid cell (row, col) is drawn in the foreground colour."""
+        return bool((self.mask >> (COLUMN_BLOCKS[col] * 5 + row)) & 1)
+    
+    def iter_svg(self, size: int = DEFAULT_SIZE, padding: int = None):
+        """Yield SVG markup in pieces: the header, one <rect> per filled cell, the closing tag."""
+        if padding is None:
+            padding = size * DEFAULT_PADDING // DEFAULT_SIZE
+        cell_size = (size - (2 * padding)) // 5
+        color = self.color_hex
+        
+        yield (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+            f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="{size}" height="{size}" fill="#{BACKGROUND[0]:02x}{BACKGROUND[1]:02x}{BACKGROUND[2]:02x}"/>'
+        )
+        for row in range(5):
+            for col in range(5):
+                if self.is_filled(row, col):
+                    yield (
+                        f'<rect x="{padding + col * cell_size}" y="{padding + row * cell_size}" '
+                        f'width="{cell_size}" height="{cell_size}" fill="{color}"/>'
+                    )
+        yield '</svg>'
+    
+    def to_svg(self, size: int = DEFAULT_SIZE, padding: int = None) -> str:
+        """Render the identicon as SVG markup with one <rect> per filled cell."""
+        return ''.join(self.iter_svg(size, padding))
+    
+    def _line_runs(self, size: int, padding: int = None):
+        """Yield (RGB scanline, number of consecutive rows using it), top to bottom."""
+        if padding is None:
+            padding = size * DEFAULT_PADDING // DEFAULT_SIZE
+        primary, secondary, lengths = (run.tolist() for run in _cell_runs(size, padding))
+        foreground = bytes(self.color)
+        background = bytes(BACKGROUND)
+        
+        def filled(row, col):
+            return row < 5 and col < 5 and self.is_filled(row, col)
+        
+        for row_a, row_b, height in zip(primary, secondary, lengths):
+            line = b''.join(
+                (foreground if filled(row_a, col_a) or filled(row_a, col_b) or filled(row_b, col_a)
+                 or filled(row_b, col_b) else background) * width
+                for col_a, col_b, width in zip(primary, secondary, lengths)
+            )
+            yield line, height
+    
+    def iter_rows(self, size: int = DEFAULT_SIZE, padding: int = None):
+        """
+        Yield the identicon as raw RGB scanlines (size * 3 bytes each, top to bottom).
+        
+        Pixel-identical to to_image, but built from byte strings without PIL.
+        """
+        for line, height in self._line_runs(size, padding):
+            for _ in range(height):
+                yield line
+    
+    def to_raw(self, size: int = DEFAULT_SIZE, padding: int = None) -> bytes:
+        """Render the identicon as raw row-major RGB bytes (size * size * 3)."""
+        return b''.join([line * height for line, height in self._line_runs(size, padding)])
+
+
+def generate_identicon_from_id(user_id: str, size: int = DEFAULT_SIZE, padding: int = None) -> tuple:
     """
     Generate the identicon image and related data from a user ID.
     
     Args:
         user_id: The GitHub user ID (string or int)
+        size: Output width and height in pixels
+        padding: Border around the grid; defaults to size / 12 (35px at 420)
         
     Returns:
         tuple: (PIL Image, dict of generation metadata)
     """
-    metadata = {}
-    
-    # Generate hash from user ID
-    hash_obj = hashlib.md5(str(user_id).encode('utf-8'))
-    hex_hash = hash_obj.hexdigest()
-    metadata['md5_hash'] = hex_hash
-    
-    # Extract color values from hash
-    hue_hex = hex_hash[-7:-4]
-    hue = int(hue_hex, 16) / 4095.0
-    metadata['hue_segment'] = hue_hex
-    
-    sat_hex = hex_hash[-4:-2]
-    saturation = 0.65 - (int(sat_hex, 16) / 255.0) * 0.20
-    metadata['sat_segment'] = sat_hex
-    
-    lig_hex = hex_hash[-2:]
-    lightness = 0.75 - (int(lig_hex, 16) / 255.0) * 0.20
-    metadata['lig_segment'] = lig_hex
-    
-    r, g, b = colorsys.hls_to_rgb(hue, lightness, saturation)
-    color = (int(r * 255), int(g * 255), int(b * 255))
-    metadata['color_rgb'] = color
-    metadata['color_hex'] = f"#{color[0]:02x}{color[1]:02x}{color[2]:02x}"
-    
-    # Store pattern segment
-    metadata['pattern_segment'] = hex_hash[:15]
-    
-    background = (240, 240, 240)
-    
-    # Generate 5x5 grid pattern
-    nibbles = [int(char, 16) for char in hex_hash[:15]]
-    grid = np.zeros((5, 5), dtype=int)
-    
-    # Center column
-    for i in range(5):
-        if nibbles[i] % 2 == 0:
-            grid[i, 2] = 1
-    
-    # Second columns (symmetric)
-    for i in range(5):
-        if nibbles[i + 5] % 2 == 0:
-            grid[i, 1] = 1
-            grid[i, 3] = 1
-    
-    # Outer columns (symmetric)
-    for i in range(5):
-        if nibbles[i + 10] % 2 == 0:
-            grid[i, 0] = 1
-            grid[i, 4] = 1
-    
-    # Create image
-    size = 420
-    padding = 35
-    img = Image.new('RGB', (size, size), background)
-    draw = ImageDraw.Draw(img)
+    identicon = Identicon.from_id(user_id)
+    return identicon.to_image(size, padding), identicon.metadata()
+
+
+def generate_identicon_svg(user_id, size: int = DEFAULT_SIZE, padding: int = None) -> str:
+    """
+    Build the identicon of a user ID as SVG markup, without rendering pixels.
+    
+    Args:
+        user_id: The GitHub user ID (string or int)
+        size: Output width and height in pixels
+        padding: Border around the grid; defaults to size / 12 (35px at 420)
+        
+    Returns:
+        str: Standalone SVG document
+    """
+    return Identicon.from_id(user_id).to_svg(size, padding)
+
+
+def generate_identicon_raw(user_id, size: int = DEFAULT_SIZE, padding: int = None) -> bytes:
+    """
+    Build the identicon of a user ID as raw RGB bytes, without PIL.
+    
+    Args:
+        user_id: The GitHub user ID (string or int)
+        size: Output width and height in pixels
+        padding: Border around the grid; defaults to size / 12 (35px at 420)
+        
+    Returns:
+        bytes: size * size * 3 bytes, row-major RGB
+    """
+    return Identicon.from_id(user_id).to_raw(size, padding)
+
+
+def get_identicon_bytes(user_id, size: int = DEFAULT_SIZE, fmt: str = 'png') -> bytes:
+    """
+    Return the encoded identicon for a user ID, served from identicon_cache when possible.
+    
+    Args:
+        user_id: The GitHub user ID (string or int)
+        size: Output width and height in pixels
+        fmt: 'png', 'svg' or 'raw' (row-major RGB)
+        
+    Returns:
+        bytes: The encoded image
+    """
+    if fmt not in ('png', 'svg', 'raw'):
+        raise ValueError(f"Unsupported identicon format '{fmt}'.")
+    
+    def encode():
+        identicon = Identicon.from_id(user_id)
+        if fmt == 'svg':
+            return identicon.to_svg(size).encode('utf-8')
+        if fmt == 'raw':
+            return identicon.to_raw(size)
+        return identicon.to_png(size)
+    
+    return identicon_cache.get_or_create((str(user_id), size, fmt), encode)
+
+
+def _md5_digests(ids) -> np.ndarray:
+    """Hash every user ID and return the raw MD5 digests as an (N, 16) uint8 array."""
+    md5 = hashlib.md5
+    raw = b''.join([md5(str(user_id).encode('utf-8')).digest() for user_id in ids])
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, 16)
+
+
+def _nibbles(digests: np.ndarray) -> np.ndarray:
+    """Split (N, 16) digest bytes into (N, 32) nibbles in hex-string order."""
+    nibbles = np.empty((digests.shape[0], 32), dtype=np.uint8)
+    nibbles[:, 0::2] = digests >> 4
+    nibbles[:, 1::2] = digests & 0x0F
+    return nibbles
+
+
+def _hue_to_channel(m1, m2, hue):
+    """Vectorized colorsys._v: one RGB channel for every hue in the array."""
+    hue = np.mod(hue, 1.0)
+    return np.select(
+        [hue < ONE_SIXTH, hue < 0.5, hue < TWO_THIRD],
+        [m1 + (m2 - m1) * hue * 6.0, m2, m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0],
+        default=m1
+    )
+
+
+def _hls_to_rgb(h, l, s) -> np.ndarray:
+    """Vectorized colorsys.hls_to_rgb returning an (N, 3) float array."""
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+    rgb = np.stack([
+        _hue_to_channel(m1, m2, h + ONE_THIRD),
+        _hue_to_channel(m1, m2, h),
+        _hue_to_channel(m1, m2, h - ONE_THIRD)
+    ], axis=-1)
+    return np.where((s == 0.0)[:, None], l[:, None], rgb)
+
+
+def _grids_from_pattern(pattern: np.ndarray) -> np.ndarray:
+    """Build the mirrored (N, 5, 5) boolean grids from (N, 15) pattern bits."""
+    # blocks[:, b, row] is pattern bit b * 5 + row
+    blocks = pattern.reshape(-1, 3, 5)
+    return blocks[:, COLUMN_BLOCKS, :].transpose(0, 2, 1)
+
+
+def _grids_from_nibbles(nibbles: np.ndarray) -> np.ndarray:
+    """Build the mirrored (N, 5, 5) boolean grids from the first 15 nibbles."""
+    return _grids_from_pattern((nibbles[:, :15] & 1) == 0)
+
+
+def _colors_from_hls(hls: np.ndarray) -> np.ndarray:
+    """Derive the (N, 3) uint8 foreground colours from 28-bit HLS segments."""
+    hls = hls.astype(np.int64)
+    hue = (hls >> 16) / 4095.0
+    saturation = 0.65 - (((hls >> 8) & 0xFF) / 255.0) * 0.20
+    lightness = 0.75 - ((hls & 0xFF) / 255.0) * 0.20
+    rgb = _hls_to_rgb(hue, lightness, saturation)
+    # int() truncation, matching the single-ID path
+    return (rgb * 255).astype(np.uint8)
+
+
+def _hls_from_nibbles(nibbles: np.ndarray) -> np.ndarray:
+    """Pack the last 7 nibbles (hue, saturation, lightness) into 28-bit integers."""
+    n = nibbles[:, 25:].astype(np.int64)
+    return (n << np.arange(24, -1, -4)).sum(axis=1)
+
+
+def _colors_from_nibbles(nibbles: np.ndarray) -> np.ndarray:
+    """Derive the (N, 3) uint8 foreground colours from the last 7 nibbles."""
+    return _colors_from_hls(_hls_from_nibbles(nibbles))
+
+
+def generate_identicons(ids) -> tuple:
+    """
+    Generate the grids and colours for many user IDs in one vectorized pass.
+    
+    Args:
+        ids: Iterable of GitHub user IDs (strings or ints)
+        
+    Returns:
+        tuple: ((N, 5, 5) bool ndarray of filled cells, (N, 3) uint8 ndarray of RGB colours)
+    """
+    nibbles = _nibbles(_md5_digests(ids))
+    return _grids_from_nibbles(nibbles), _colors_from_nibbles(nibbles)
+
+
+def pack_identicons(ids) -> np.ndarray:
+    """
+    Compute the packed 43-bit identicon codes of many user IDs.
+    
+    Args:
+        ids: Iterable of GitHub user IDs (strings or ints)
+        
+    Returns:
+        np.ndarray: (N,) uint64 codes, as Identicon.code
+    """
+    nibbles = _nibbles(_md5_digests(ids))
+    mask = ((nibbles[:, :PATTERN_BITS] & 1) == 0).astype(np.int64) << np.arange(PATTERN_BITS)
+    return ((mask.sum(axis=1) << HLS_BITS) | _hls_from_nibbles(nibbles)).astype(np.uint64)
+
+
+def unpack_codes(codes) -> tuple:
+    """
+    Expand packed identicon codes.
+    
+    Args:
+        codes: Array-like of 43-bit codes
+        
+    Returns:
+        tuple: ((N,) int64 pattern masks, (N, 3) uint8 RGB colours)
+    """
+    codes = np.asarray(codes, dtype=np.uint64).astype(np.int64)
+    return codes >> HLS_BITS, _colors_from_hls(codes & ((1 << HLS_BITS) - 1))
+
+
+def grids_from_masks(masks) -> np.ndarray:
+    """Build the mirrored (N, 5, 5) boolean grids from 15-bit pattern masks."""
+    masks = np.asarray(masks, dtype=np.int64).reshape(-1)
+    return _grids_from_pattern(((masks[:, None] >> np.arange(PATTERN_BITS)) & 1).astype(bool))
+
+
+def mask_from_grid(grid) -> int:
+    """
+    Recover the 15-bit pattern mask of a mirrored 5x5 grid.
+    
+    Raises:
+        ValueError: If the grid is not 5x5 or not mirror-symmetric
+    """
+    grid = np.asarray(grid, dtype=bool)
+    if grid.shape != (5, 5) or not np.array_equal(grid, grid[:, ::-1]):
+        raise ValueError("Identicon grids are 5x5 and mirror-symmetric.")
+    # Columns 2, 1, 0 hold pattern blocks 0, 1, 2 (bits block * 5 + row)
+    bits = grid[:, [2, 1, 0]].T.reshape(-1)
+    return int((bits.astype(np.int64) << np.arange(PATTERN_BITS)).sum())
+
+
+@lru_cache(maxsize=32)
+def _cell_runs(size: int, padding: int) -> tuple:
+    """
+    Split one axis of the canvas into runs of pixels covered by the same cells.
+    
+    Cells are drawn with inclusive bounds (the ImageDraw.rectangle convention),
+    so the pixel on a cell boundary is covered by two cells and forms its own
+    run. Index 5 points at an always-empty sentinel cell.
+    
+    Returns:
+        tuple: (primary cell per run, secondary cell per run, run lengths)
+    """
     cell_size = (size - (2 * padding)) // 5
+    if cell_size < 1:
+        raise ValueError(f"Size {size} leaves no room for a 5x5 grid with padding {padding}.")
+    
+    offset = np.arange(size) - padding
+    cell = np.floor_divide(offset, cell_size)
+    on_edge = (offset % cell_size == 0) & (cell >= 1) & (cell <= 5)
+    primary = np.where((offset >= 0) & (cell < 5), cell, 5)
+    secondary = np.where(on_edge, cell - 1, 5)
     
+    starts = np.flatnonzero(np.r_[True, (np.diff(primary) != 0) | (np.diff(secondary) != 0)])
+    lengths = np.diff(np.r_[starts, size])
+    return primary[starts], secondary[starts], lengths
+
+
+@lru_cache(maxsize=8)
+def _background_tile(size: int) -> np.ndarray:
+    """A read-only (size, size, 3) uint8 canvas filled with the background colour."""
+    tile = np.tile(np.asarray(BACKGROUND, dtype=np.uint8), size * size).reshape(size, size, 3)
+    tile.flags.writeable = False
+    return tile
+
+
+def rasterize_identicons(grids: np.ndarray, colors: np.ndarray, size: int = DEFAULT_SIZE,
+                         padding: int = None, out: np.ndarray = None) -> np.ndarray:
+    """
+    Draw grids into padded RGB pixel buffers with array ops.
+    
+    The buffer is filled from a cached background tile, then each of the 25
+    cell positions is painted with one slice assignment across every image
+    that fills it. Cells keep the inclusive ImageDraw.rectangle bounds.
+    
+    Args:
+        grids: (N, 5, 5) bool array of filled cells
+        colors: (N, 3) uint8 array of foreground colours
+        size: Output width and height in pixels
+        padding: Border around the grid; defaults to size / 12
+        out: Optional preallocated C-contiguous (N, size, size, 3) uint8 buffer to fill
+        
+    Returns:
+        np.ndarray: (N, size, size, 3) uint8 pixel buffer
+    """
+    if padding is None:
+        padding = size * DEFAULT_PADDING // DEFAULT_SIZE
+    cell_size = (size - (2 * padding)) // 5
+    if cell_size < 1:
+        raise ValueError(f"Size {size} leaves no room for a 5x5 grid with padding {padding}.")
+    count = grids.shape[0]
+    colors = np.asarray(colors, dtype=np.uint8)
+    
+    if out is None:
+        out = np.empty((count, size, size, 3), dtype=np.uint8)
+    out[...] = _background_tile(size)
+    # Scanline view, so each cell is a run of whole bytes per row rather than per-pixel broadcasts
+    lines = out.reshape(count, size, size * 3)
+    bounds = [(padding + k * cell_size, min(padding + (k + 1) * cell_size + 1, size)) for k in range(5)]
+    
+    for col, (x0, x1) in enumerate(bounds):
+        runs = np.tile(colors, (1, x1 - x0))[:, None, :]
+        for row, (y0, y1) in enumerate(bounds):
+            filled = np.flatnonzero(grids[:, row, col])
+            if len(filled) == count:
+                lines[:, y0:y1, x0 * 3:x1 * 3] = runs
+            elif len(filled):
+                lines[filled, y0:y1, x0 * 3:x1 * 3] = runs[filled]
+    return out
+
+
+def render_identicon(grid, color, size: int = DEFAULT_SIZE, padding: int = None) -> Image.Image:
+    """
+    Render a single 5x5 grid and RGB colour to a PIL image.
+    
+    A single image is drawn straight into a PIL canvas: going through a numpy
+    buffer would cost an extra raw decode in Image.frombuffer.
+    """
+    if padding is None:
+        padding = size * DEFAULT_PADDING // DEFAULT_SIZE
+    cell_size = (size - (2 * padding)) // 5
+    if cell_size < 1:
+        raise ValueError(f"Size {size} leaves no room for a 5x5 grid with padding {padding}.")
+    
+    img = Image.new('RGB', (size, size), BACKGROUND)
+    draw = ImageDraw.Draw(img)
+    # Plain Python values: numpy scalars make every index and fill noticeably slower
+    color = tuple(int(channel) for channel in color)
+    cells = np.asarray(grid).tolist()
     for row in range(5):
         for col in range(5):
-            if grid[row, col] == 1:
+            if cells[row][col]:
                 x0 = padding + (col * cell_size)
                 y0 = padding + (row * cell_size)
-                x1 = x0 + cell_size
-                y1 = y0 + cell_size
-                draw.rectangle([x0, y0, x1, y1], fill=color)
-                
-    return img, metadata
+                draw.rectangle([x0, y0, x0 + cell_size, y0 + cell_size], fill=color)
+    return img
+
+
+def atlas_layout(count: int, columns: int = None) -> tuple:
+    """Return (columns, rows) of an atlas holding count tiles; defaults to a near-square grid."""
+    columns = columns or max(1, int(np.ceil(np.sqrt(count))))
+    return columns, max(1, -(-count // columns))
+
+
+def atlas_offsets(ids, size: int = DEFAULT_SIZE, columns: int = None, start: int = 0) -> dict:
+    """
+    Build the JSON-serialisable offset map of an atlas without rendering it.
+    
+    Args:
+        ids: User IDs in tile order
+        size: Tile width and height in pixels
+        columns: Atlas width in tiles; defaults to a near-square grid
+        start: Tile index of the first ID (for atlases filled in parts)
+        
+    Returns:
+        dict: size, columns, rows, width, height and tiles ({id: {x, y, w, h}});
+            a repeated ID points at its first tile
+    """
+    ids = [str(user_id) for user_id in ids]
+    columns, rows = atlas_layout(start + len(ids), columns)
+    tiles = {}
+    for index, user_id in enumerate(ids, start):
+        row, col = divmod(index, columns)
+        tiles.setdefault(user_id, {'x': col * size, 'y': row * size, 'w': size, 'h': size})
+    return {
+        'size': size,
+        'columns': columns,
+        'rows': rows,
+        'width': columns * size,
+        'height': rows * size,
+        'tiles': tiles,
+    }
+
+
+def render_atlas(ids, size: int = DEFAULT_SIZE, padding: int = None, columns: int = None,
+                 out: np.ndarray = None, start: int = 0) -> tuple:
+    """
+    Pack the identicons of many user IDs into one atlas image buffer.
+    
+    Tiles are rasterized in batches into a small scratch buffer and copied
+    into their slots with a single strided assignment per batch, so the only
+    large allocation is the atlas itself (or none, when out is given).
+    
+    Args:
+        ids: User IDs in tile order (left to right, top to bottom)
+        size: Tile width and height in pixels
+        padding: Border inside each tile; defaults to size / 12
+        columns: Atlas width in tiles; defaults to a near-square grid
+        out: Optional preallocated C-contiguous (rows * size, columns * size, 3) uint8
+            buffer (e.g. a memmap) to fill; unused tiles are left untouched
+        start: Tile index of the first ID, for filling a shared atlas in parts
+        
+    Returns:
+        tuple: ((height, width, 3) uint8 atlas buffer, offset map as from atlas_offsets)
+    """
+    ids = list(ids)
+    offsets = atlas_offsets(ids, size, columns, start)
+    columns = offsets['columns']
+    if out is None:
+        out = np.full((offsets['height'], offsets['width'], 3), 255, dtype=np.uint8)
+    rows = out.shape[0] // size
+    if out.shape[1:] != (columns * size, 3) or start + len(ids) > rows * columns:
+        raise ValueError(f"Atlas buffer of shape {out.shape} cannot hold these tiles.")
+    
+    # (row, y, column, x, channel) view: tile i is tiles[i // columns, :, i % columns]
+    tiles = out.reshape(rows, size, columns, size, 3)
+    scratch = np.empty((min(ATLAS_BATCH, len(ids)), size, size, 3), dtype=np.uint8)
+    for offset in range(0, len(ids), ATLAS_BATCH):
+        batch = ids[offset:offset + ATLAS_BATCH]
+        grids, colors = generate_identicons(batch)
+        pixels = rasterize_identicons(grids, colors, size, padding, out=scratch[:len(batch)])
+        row, col = np.divmod(np.arange(start + offset, start + offset + len(batch)), columns)
+        tiles[row, :, col] = pixels
+    return out, offsets
+
+
+def get_atlas_bytes(ids, size: int = DEFAULT_SIZE, columns: int = None) -> tuple:
+    """Render an atlas and return (PNG bytes, offset map)."""
+    pixels, offsets = render_atlas(ids, size, columns=columns)
+    image = Image.frombuffer('RGB', (offsets['width'], offsets['height']), pixels, 'raw', 'RGB', 0, 1)
+    return image_to_bytes(image), offsets
@@ -0,0 +1,210 @@
+"""
+Reverse index of identicons.
+
+Stores every indexed ID next to its packed 43-bit identicon code in flat
+arrays, plus one permutation ordering the IDs by what they look like
+(pattern mask, then RGB colour). Pattern and image queries are binary
+searches into that order, so nothing is re-hashed after the index is built:
+
+    python -m src.index --range 1 5000000 --output ids.npz
+"""
+
+import argparse
+import numpy as np
+from .identicon import pack_identicons, unpack_codes, Identicon, PATTERN_BITS
+from .decode import decode_identicon, DEFAULT_TOLERANCE
+
+# IDs hashed per step while building (bounds temporary memory)
+BUILD_CHUNK = 1 << 20
+# Bits of the visual key below the pattern mask (0xRRGGBB)
+RGB_BITS = 24
+
+
+def visual_keys(codes) -> np.ndarray:
+    """Map packed codes to visual keys (mask << 24 | rgb); equal keys render identically."""
+    masks, colors = unpack_codes(codes)
+    rgb = (colors[:, 0].astype(np.int64) << 16) | (colors[:, 1].astype(np.int64) << 8) | colors[:, 2]
+    return ((masks << RGB_BITS) | rgb).astype(np.uint64)
+
+
+class IdenticonIndex:
+    """
+    Columnar, array-backed index from identicon appearance to user IDs.
+
+    Columns:
+        ids: Sorted, unique int64 user IDs
+        codes: uint64 packed identicon code of each ID (see Identicon.code)
+        order: Permutation sorting ids by visual key, ties by ID
+        keys: Visual keys in that order
+
+    Use from_ids / from_range to build and save / load to persist.
+    """
+
+    def __init__(self, ids: np.ndarray, codes: np.ndarray, order: np.ndarray = None, keys: np.ndarray = None):
+        self.ids = ids
+        self.codes = codes
+        if order is None or keys is None:
+            keys = visual_keys(codes)
+            order = np.argsort(keys, kind='stable')
+            keys = keys[order]
+        self.order = order
+        self.keys = keys
+
+    @classmethod
+    def from_ids(cls, ids) -> 'IdenticonIndex':
+        """Hash and index an iterable of numeric user IDs (duplicates are dropped)."""
+        ids = np.unique(np.fromiter((int(user_id) for user_id in ids), dtype=np.int64))
+        codes = np.empty(len(ids), dtype=np.uint64)
+        for start in range(0, len(ids), BUILD_CHUNK):
+            codes[start:start + BUILD_CHUNK] = pack_identicons(ids[start:start + BUILD_CHUNK].tolist())
+        return cls(ids, codes)
+
+    @classmethod
+    def from_range(cls, start: int, end: int) -> 'IdenticonIndex':
+        """Hash and index every ID in [start, end]."""
+        return cls.from_ids(range(start, end + 1))
+
+    @classmethod
+    def load(cls, path: str) -> 'IdenticonIndex':
+        """Load an index written by save."""
+        with np.load(path) as data:
+            return cls(data['ids'], data['codes'], data['order'], data['keys'])
+
+    def save(self, path: str):
+        """Write the index columns to an uncompressed .npz file."""
+        np.savez(path, ids=self.ids, codes=self.codes, order=self.order, keys=self.keys)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, user_id):
+        position = np.searchsorted(self.ids, int(user_id))
+        return position < len(self.ids) and self.ids[position] == int(user_id)
+
+    def code_of(self, user_id) -> int:
+        """Packed code of an indexed ID, or None if it is not indexed."""
+        position = np.searchsorted(self.ids, int(user_id))
+        if position < len(self.ids) and self.ids[position] == int(user_id):
+            return int(self.codes[position])
+        return None
+
+    def _select(self, low: int, high: int, start: int = None, end: int = None) -> np.ndarray:
+        """IDs whose visual key is in [low, high), optionally limited to IDs in [start, end]."""
+        left, right = np.searchsorted(self.keys, np.array([low, high], dtype=np.uint64))
+        ids = self.ids[self.order[left:right]]
+        if start is not None:
+            ids = ids[ids >= start]
+        if end is not None:
+            ids = ids[ids <= end]
+        return np.sort(ids)
+
+    def with_pattern(self, mask: int, start: int = None, end: int = None) -> np.ndarray:
+        """
+        IDs whose identicon has the given pattern, in any colour.
+
+        Args:
+            mask: 15-bit pattern mask (see Identicon.mask and mask_from_grid)
+            start: Optional lowest ID to return
+            end: Optional highest ID to return
+
+        Returns:
+            np.ndarray: Sorted int64 IDs
+        """
+        if not 0 <= mask < (1 << PATTERN_BITS):
+            raise ValueError(f"Pattern mask must fit in {PATTERN_BITS} bits.")
+        return self._select(mask << RGB_BITS, (mask + 1) << RGB_BITS, start, end)
+
+    def matching(self, mask: int, rgb: int, start: int = None, end: int = None) -> np.ndarray:
+        """
+        IDs whose identicon renders to exactly this pattern and colour.
+
+        Args:
+            mask: 15-bit pattern mask
+            rgb: Foreground colour packed as 0xRRGGBB
+            start: Optional lowest ID to return
+            end: Optional highest ID to return
+
+        Returns:
+            np.ndarray: Sorted int64 IDs
+        """
+        key = (mask << RGB_BITS) | rgb
+        return self._select(key, key + 1, start, end)
+
+    def near(self, mask: int, rgb: int, tolerance: int = DEFAULT_TOLERANCE,
+             start: int = None, end: int = None) -> np.ndarray:
+        """
+        IDs with this pattern and a colour within tolerance of rgb on every channel.
+
+        Args:
+            mask: 15-bit pattern mask
+            rgb: Foreground colour packed as 0xRRGGBB (None matches any colour)
+            tolerance: Largest per-channel colour difference still accepted
+            start: Optional lowest ID to return
+            end: Optional highest ID to return
+
+        Returns:
+            np.ndarray: Sorted int64 IDs
+        """
+        left, right = np.searchsorted(self.keys, np.array([mask << RGB_BITS, (mask + 1) << RGB_BITS], dtype=np.uint64))
+        keys = self.keys[left:right].astype(np.int64)
+        ids = self.ids[self.order[left:right]]
+        if rgb is not None:
+            shifts = np.array([16, 8, 0])
+            diff = np.abs(((keys[:, None] >> shifts) & 0xFF) - ((rgb >> shifts) & 0xFF)).max(axis=1)
+            ids = ids[diff <= tolerance]
+        if start is not None:
+            ids = ids[ids >= start]
+        if end is not None:
+            ids = ids[ids <= end]
+        return np.sort(ids)
+
+    def matching_image(self, image, tolerance: int = DEFAULT_TOLERANCE) -> np.ndarray:
+        """IDs whose identicon matches a (possibly resized or JPEG-compressed) identicon image."""
+        return self.near(*decode_identicon(image), tolerance)
+
+    def lookalikes(self, identicon: Identicon) -> np.ndarray:
+        """IDs (including its own, if indexed) that share an identicon's image."""
+        return self.matching(identicon.mask, identicon.rgb)
+
+    def collisions(self, min_count: int = 2) -> list:
+        """
+        Groups of IDs sharing the same rendered identicon.
+
+        Args:
+            min_count: Smallest group size to report
+
+        Returns:
+            list: (mask, rgb, sorted int64 IDs) tuples, largest groups first
+        """
+        if not len(self.keys):
+            return []
+        starts = np.flatnonzero(np.r_[True, self.keys[1:] != self.keys[:-1]])
+        counts = np.diff(np.r_[starts, len(self.keys)])
+        groups = []
+        for start, count in zip(starts[counts >= min_count], counts[counts >= min_count]):
+            key = int(self.keys[start])
+            ids = np.sort(self.ids[self.order[start:start + count]])
+            groups.append((key >> RGB_BITS, key & 0xFFFFFF, ids))
+        groups.sort(key=lambda group: -len(group[2]))
+        return groups
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build an identicon reverse index and report collisions.")
+    parser.add_argument('--range', nargs=2, type=int, required=True, metavar=('START', 'END'),
+                        help="Index IDs START..END inclusive")
+    parser.add_argument('--output', help="Save the index to this .npz file")
+    parser.add_argument('--top', type=int, default=10, help="Largest collision groups to print")
+    args = parser.parse_args(argv)
+
+    index = IdenticonIndex.from_range(*args.range)
+    if args.output:
+        index.save(args.output)
+    groups = index.collisions()
+    print(f"Indexed {len(index):,} IDs; {len(groups):,} identicons are shared by more than one ID")
+    for mask, rgb, ids in groups[:args.top]:
+        print(f"  pattern 0x{mask:04x} #{rgb:06x}: {', '.join(map(str, ids))}")
+
+
+if __name__ == '__main__':
+    main()
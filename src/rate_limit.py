@@ -0,0 +1,178 @@
+import threading
+import time
+import requests
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised instead of sending a request while the budget is exhausted for longer than the limiter allows."""
+
+    def __init__(self, key, wait: float):
+        super().__init__(f"Rate limit budget for {key[0]} exhausted; next request possible in {wait:.0f}s")
+        self.key = key
+        self.wait = wait
+
+
+class _Bucket:
+    """Token bucket pacing the remaining budget of one credential over its reset window."""
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.tokens = 0.0
+        self.capacity = 0.0
+        self.floor = 0.0
+        self.rate = None
+        self.pace = None
+        self.updated = 0.0
+
+    def refill(self, now: float):
+        if self.rate is None:
+            return
+        if now >= self.reset_at:
+            # Window rolled over; budget is unknown again until the next response
+            self.rate = None
+            return
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.pace)
+        self.updated = now
+
+    def reserve(self, now: float) -> tuple:
+        """
+        Take one token, queueing behind earlier callers once the burst share is spent.
+
+        Returns:
+            tuple: (pacing delay, time until the budget is available again at all)
+        """
+        blocked = max(self.blocked_until - now, 0.0)
+        self.refill(now)
+        if self.rate is None:
+            return 0.0, blocked
+        # The deficit is bounded: callers beyond a full queue share its last slot
+        self.tokens = max(self.tokens - 1, self.floor)
+        return max(-self.tokens, 0.0) / self.pace, blocked
+
+    def release(self):
+        self.tokens = min(self.tokens + 1, self.capacity)
+
+
+class RateLimiter:
+    """
+    Request scheduler driven by GitHub's rate-limit response headers.
+
+    Every response's X-RateLimit-Limit / -Remaining / -Reset and Retry-After
+    headers update a token bucket for its (resource, credential) key. Part of
+    the remaining budget may be spent back-to-back; the rest is spread evenly
+    over the time left in the window, so callers are delayed a little up front
+    instead of bursting into a 403. When that even spread is slower than a
+    caller can wait (60/h is one request a minute), the rest is paced at
+    max_queue requests per max_wait instead. Concurrent callers take
+    successive slots of that pace, so they are staggered rather than released
+    together, and no caller waits longer than max_wait. Requests are only
+    refused once the budget is actually exhausted (or Retry-After blocks the
+    key) for longer than max_wait. Conditional requests are not paced, since
+    GitHub does not charge for a 304. Unknown keys (no response seen yet) and
+    rolled-over windows are not throttled.
+
+    Args:
+        max_wait: Longest a request is delayed; an exhausted budget lasting longer raises RateLimitExceeded
+        burst_fraction: Share of the remaining budget usable without pacing
+        max_queue: Most callers queued for pacing at once (the bucket's largest deficit)
+    """
+
+    def __init__(self, max_wait: float = 5.0, burst_fraction: float = 0.5, max_queue: int = 8,
+                 clock=time.time, sleep=time.sleep):
+        self.max_wait = max_wait
+        self.burst_fraction = burst_fraction
+        self.max_queue = max_queue
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, conditional: bool = False):
+        """
+        Block until a request for key may be sent, or raise RateLimitExceeded if its budget is exhausted.
+
+        Args:
+            key: (resource, credential) the request is charged to
+            conditional: The request carries If-None-Match / If-Modified-Since and
+                is free when answered with 304, so it is not paced
+        """
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return
+            if conditional:
+                pace, blocked = 0.0, max(bucket.blocked_until - self._clock(), 0.0)
+            else:
+                pace, blocked = bucket.reserve(self._clock())
+            if blocked > self.max_wait:
+                if not conditional:
+                    bucket.release()
+                raise RateLimitExceeded(key, blocked)
+            wait = min(max(pace, blocked), self.max_wait)
+        if wait > 0:
+            self._sleep(wait)
+
+    def update(self, key, response: requests.Response):
+        """Feed the rate-limit headers of a response (including 304s) into the bucket for key."""
+        headers = response.headers
+        remaining = headers.get('X-RateLimit-Remaining')
+        retry_after = headers.get('Retry-After')
+        if remaining is None and retry_after is None:
+            return
+
+        now = self._clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket()
+            if retry_after is not None:
+                try:
+                    bucket.blocked_until = max(bucket.blocked_until, now + float(retry_after))
+                except ValueError:
+                    pass
+            if remaining is None:
+                return
+
+            bucket.refill(now)
+            fresh = bucket.rate is None
+            bucket.remaining = int(remaining)
+            bucket.limit = int(headers.get('X-RateLimit-Limit', bucket.limit or remaining))
+            bucket.reset_at = float(headers.get('X-RateLimit-Reset', now + 3600))
+            bucket.rate = bucket.remaining / max(bucket.reset_at - now, 1.0)
+            bucket.pace = max(bucket.rate, self.max_queue / max(self.max_wait, 1e-3))
+            bucket.capacity = max(1.0, bucket.remaining * self.burst_fraction)
+            bucket.floor = -float(self.max_queue)
+            tokens = bucket.capacity if fresh else bucket.tokens
+            bucket.tokens = min(max(tokens, bucket.floor), bucket.capacity)
+            bucket.updated = now
+            if bucket.remaining == 0:
+                bucket.blocked_until = max(bucket.blocked_until, bucket.reset_at)
+
+    def remaining(self, key):
+        """Remaining request budget reported for key, or None if unknown."""
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return None
+            if bucket.reset_at and self._clock() >= bucket.reset_at:
+                return bucket.limit
+            return bucket.remaining
+
+    def stats(self) -> dict:
+        """Budget per key: limit, remaining, reset time and currently available tokens."""
+        now = self._clock()
+        with self._lock:
+            snapshot = {}
+            for key, bucket in self._buckets.items():
+                bucket.refill(now)
+                snapshot[key] = {
+                    'limit': bucket.limit,
+                    'remaining': bucket.remaining,
+                    'reset_at': bucket.reset_at,
+                    'tokens': max(bucket.tokens, 0.0),
+                    'blocked_for': max(bucket.blocked_until - now, 0.0),
+                }
+            return snapshot
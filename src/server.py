@@ -0,0 +1,156 @@
+"""
+Stateless HTTP identicon endpoint.
+
+    GET /identicon/{id}.png?size=N
+    GET /identicon/{id}.svg?size=N
+    GET /atlas.png?ids=1,2,3&size=N[&columns=C]
+    GET /atlas.json?ids=1,2,3&size=N[&columns=C]
+
+The atlas routes pack many identicons into one image; atlas.json is its
+offset map ({id: {x, y, w, h}}), so a page showing hundreds of avatars makes
+two requests instead of hundreds. An atlas is capped by its total pixel
+count (MAX_ATLAS_PIXELS), so more IDs mean smaller tiles.
+
+Identicons are a pure function of (id, size, format), so responses carry a
+strong ETag derived from those inputs and are marked immutable; revalidation
+is answered with 304 without rendering anything, and so is HEAD unless the
+bytes are already cached (then with their Content-Length). Any WSGI server can host
+`application` (e.g. `gunicorn src.server:application`); `python -m src.server`
+runs the standard library server for local use.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+from urllib.parse import parse_qs
+from wsgiref.simple_server import make_server
+from .identicon import (
+    get_identicon_bytes,
+    get_atlas_bytes,
+    atlas_offsets,
+    atlas_layout,
+    identicon_cache,
+    DEFAULT_SIZE
+)
+
+# Bump whenever rendering changes so CDNs and browsers pick up new bytes
+RENDER_VERSION = '2'
+
+MIN_SIZE = 16
+MAX_SIZE = 2048
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+MAX_ATLAS_IDS = 1024
+# Pixels per atlas (columns * rows * size^2): 12 MB of RGB, e.g. 1024 tiles at 64px or 64 at 256px
+MAX_ATLAS_PIXELS = 1 << 22
+CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml', 'json': 'application/json'}
+
+_ROUTE = re.compile(r'^/identicon/(\d{1,18})\.(png|svg)$')
+_ATLAS_ROUTE = re.compile(r'^/atlas\.(png|json)$')
+_ID = re.compile(r'^\d{1,18}$')
+
+
+def identicon_etag(user_id, size: int, fmt: str) -> str:
+    """Strong ETag for a rendered identicon (or atlas), computed without rendering it."""
+    digest = hashlib.sha1(f"{RENDER_VERSION}:{user_id}:{size}:{fmt}".encode('utf-8')).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _respond(start_response, status: str, body: bytes = b'', headers=None, head_only: bool = False):
+    """Send a response; a HEAD response with body None goes out without Content-Length."""
+    headers = list(headers or [])
+    if not any(name == 'Content-Type' for name, _ in headers):
+        headers.append(('Content-Type', 'text/plain; charset=utf-8'))
+    if body is not None:
+        headers.append(('Content-Length', str(len(body))))
+    start_response(status, headers)
+    return [] if head_only else [body]
+
+
+def application(environ, start_response):
+    """WSGI entry point serving deterministic identicons."""
+    method = environ.get('REQUEST_METHOD', 'GET')
+    if method not in ('GET', 'HEAD'):
+        return _respond(start_response, '405 Method Not Allowed', b'Method not allowed\n', [('Allow', 'GET, HEAD')])
+    head_only = method == 'HEAD'
+
+    path = environ.get('PATH_INFO', '')
+    query = parse_qs(environ.get('QUERY_STRING', ''))
+    match = _ROUTE.match(path)
+    atlas_match = _ATLAS_ROUTE.match(path)
+    if not match and not atlas_match:
+        return _respond(start_response, '404 Not Found', b'Not found\n', head_only=head_only)
+
+    try:
+        size = int(query.get('size', [DEFAULT_SIZE if match else 64])[0])
+    except ValueError:
+        size = 0
+    if not MIN_SIZE <= size <= MAX_SIZE:
+        message = f"size must be an integer between {MIN_SIZE} and {MAX_SIZE}\n".encode('utf-8')
+        return _respond(start_response, '400 Bad Request', message, head_only=head_only)
+
+    if match:
+        user_id = int(match.group(1))
+        fmt = match.group(2)
+        etag = identicon_etag(user_id, size, fmt)
+        render = lambda: get_identicon_bytes(user_id, size, fmt)
+        cached = lambda: identicon_cache.get((str(user_id), size, fmt))
+    else:
+        fmt = atlas_match.group(1)
+        ids = [value for value in ','.join(query.get('ids', [])).split(',') if value]
+        try:
+            columns = int(query.get('columns', [0])[0]) or None
+        except ValueError:
+            columns = -1
+        if not ids or len(ids) > MAX_ATLAS_IDS or not all(_ID.match(value) for value in ids) \
+                or (columns is not None and not 1 <= columns <= len(ids)):
+            message = (
+                f"ids must be 1 to {MAX_ATLAS_IDS} comma-separated numeric IDs "
+                f"and columns at most their count\n"
+            ).encode('utf-8')
+            return _respond(start_response, '400 Bad Request', message, head_only=head_only)
+        # Same normalisation as /identicon/{id}: 007 and 7 are the same user
+        ids = [str(int(value)) for value in ids]
+        columns, rows = atlas_layout(len(ids), columns)
+        if columns * rows * size * size > MAX_ATLAS_PIXELS:
+            message = f"atlas would exceed {MAX_ATLAS_PIXELS} pixels; request fewer ids or a smaller size\n".encode('utf-8')
+            return _respond(start_response, '400 Bad Request', message, head_only=head_only)
+        etag = identicon_etag(f"atlas:{','.join(ids)}:{columns}", size, fmt)
+        if fmt == 'json':
+            render = lambda: json.dumps(atlas_offsets(ids, size, columns)).encode('utf-8')
+        else:
+            render = lambda: get_atlas_bytes(ids, size, columns)[0]
+        cached = lambda: None
+
+    cache_headers = [('ETag', etag), ('Cache-Control', CACHE_CONTROL)]
+    if _etag_matches(environ.get('HTTP_IF_NONE_MATCH', ''), etag):
+        start_response('304 Not Modified', cache_headers)
+        return []
+
+    # HEAD never renders: the length is only reported when the bytes are already cached
+    body = cached() if head_only else render()
+    return _respond(
+        start_response, '200 OK', body,
+        [('Content-Type', CONTENT_TYPES[fmt])] + cache_headers,
+        head_only=head_only
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve GitHub identicons over HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    with make_server(args.host, args.port, application) as server:
+        print(f"Serving identicons on http://{args.host}:{args.port}/identicon/<id>.png")
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
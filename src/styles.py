@@ -228,6 +228,92 @@ CSS = """
         color: #111 !important;
     }
     
+    /* Repository cards */
+    .repo-list {
+        max-height: 320px;
+        overflow-y: auto;
+        padding-right: 4px;
+    }
+    .repo-card {
+        background: #fff;
+        border: 1px solid #e8e8e8;
+        border-radius: 8px;
+        padding: 0.875rem;
+        margin-bottom: 0.5rem;
+        transition: all 0.2s;
+    }
+    .repo-card .repo-name {
+        margin: 0;
+        font-weight: 600;
+        font-size: 0.9rem;
+        color: #111;
+    }
+    .repo-card .repo-desc {
+        margin: 0.5rem 0 0 0;
+        font-size: 0.8rem;
+        color: #666;
+        line-height: 1.4;
+    }
+    .repo-card .repo-meta {
+        display: flex;
+        gap: 1rem;
+        margin-top: 0.5rem;
+        font-size: 0.75rem;
+        color: #666;
+    }
+    .repo-card .repo-lang {
+        display: inline-flex;
+        align-items: center;
+        gap: 4px;
+    }
+    .repo-card .lang-dot {
+        width: 10px;
+        height: 10px;
+        border-radius: 50%;
+        background: #888888;
+    }
+    
+    /* Follower/following pills */
+    .follow-list {
+        background: #fafafa;
+        border: 1px solid #eeeeee;
+        border-radius: 8px;
+        padding: 0.75rem;
+        display: flex;
+        flex-wrap: wrap;
+        gap: 0.5rem;
+        max-height: 350px;
+        overflow-y: auto;
+    }
+    .follow-list > span {
+        background: #fff;
+        border: 1px solid #ddd;
+        padding: 4px 10px;
+        border-radius: 16px;
+        font-size: 0.8rem;
+        color: #333;
+        cursor: pointer;
+    }
+    .follow-list .follow-more {
+        width: 100%;
+        text-align: center;
+        color: #999;
+        font-size: 0.75rem;
+        margin-top: 0.5rem;
+        padding-top: 0.5rem;
+        border-top: 1px dashed #eee;
+    }
+    
+    /* Empty list placeholder */
+    .empty-list {
+        background: #fafafa;
+        border: 1px solid #eeeeee;
+        border-radius: 8px;
+        padding: 1rem;
+        color: #888;
+        font-size: 0.85rem;
+    }
+    
     /* Hide 'Press Enter to apply' in text inputs */
     [data-testid="InputInstructions"] {
         display: none !important;
@@ -1,7 +1,14 @@
+import hashlib
+import json
+import mimetypes
+from functools import lru_cache
+from html import escape
 import streamlit as st
-import requests
+from ..cache import ByteLRUCache
 from ..styles import GEAR_ICON
-from ..utils import format_number, format_account_age, image_to_bytes
+from ..github_api import get_avatar
+from ..identicon import get_identicon_bytes
+from ..utils import format_number, format_account_age
 
 def render_token_settings():
     """Render the token settings panel if visible."""
@@ -37,20 +44,20 @@ def render_token_settings():
         </p>
         ''', unsafe_allow_html=True)
 
-def render_avatar_comparison(user_data, generated_image, generated_username):
-    """Render the avatar comparison section."""
+def render_avatar_comparison(user_data, identicon, generated_username):
+    """Render the avatar comparison section, rendering the identicon on demand."""
     st.markdown("---")
     st.markdown('<p style="font-weight: 600; font-size: 0.9rem; color: #333333; margin-bottom: 0.75rem;">Avatar Comparison</p>', unsafe_allow_html=True)
     
     # Determine correct username for filenames
-    display_username = user_data.get('login', generated_username)
+    display_username = user_data.get('login') or generated_username
 
     col1, col2 = st.columns(2)
     with col1:
         st.markdown('<p style="font-size: 0.75rem; color: #888888; text-align: center; margin-bottom: 0.5rem;">Default Identicon</p>', unsafe_allow_html=True)
-        st.image(generated_image, use_container_width=True)
+        img_bytes = get_identicon_bytes(identicon.user_id)
+        st.image(img_bytes, use_container_width=True)
         
-        img_bytes = image_to_bytes(generated_image)
         st.download_button(
             label="Download Default",
             data=img_bytes,
@@ -58,28 +65,25 @@ def render_avatar_comparison(user_data, generated_image, generated_username):
             mime="image/png",
             use_container_width=True
         )
-    
+        st.download_button(
+            label="Download SVG",
+            data=get_identicon_bytes(identicon.user_id, fmt='svg'),
+            file_name=f"identicon_{display_username}.svg",
+            mime="image/svg+xml",
+            use_container_width=True
+        )
+
     with col2:
         st.markdown('<p style="font-size: 0.75rem; color: #888888; text-align: center; margin-bottom: 0.5rem;">Current Avatar</p>', unsafe_allow_html=True)
         avatar_url = user_data.get('avatar_url')
         if avatar_url:
             st.image(avatar_url, use_container_width=True)
-            # Try to fetch avatar bytes
-            try:
-                # We need a small timeout so we don't hang the UI
-                response = requests.get(avatar_url, timeout=5)
-                if response.status_code == 200:
-                    st.download_button(
-                        label="Download Current",
-                        data=response.content,
-                        file_name=f"avatar_{display_username}.png",
-                        mime="image/png",
-                        use_container_width=True
-                    )
-                else:
-                    st.button("Current N/A", disabled=True, use_container_width=True, key="dl_disabled_1")
-            except:
-                st.button("Current N/A", disabled=True, use_container_width=True, key="dl_disabled_2")
+            # Bytes are downloaded in the background and cached; never block the page on them
+            content, content_type, error = get_avatar(avatar_url)
+            if content is None and error is None:
+                avatar_download_pending(avatar_url, display_username)
+            else:
+                render_avatar_download(content, content_type, display_username)
         else:
             st.markdown('<p style="text-align: center; color: #cccccc; padding: 2rem 0;">Not available</p>', unsafe_allow_html=True)
             st.button("Current N/A", disabled=True, use_container_width=True, key="dl_disabled_3")
@@ -93,6 +97,36 @@ def render_avatar_comparison(user_data, generated_image, generated_username):
         unsafe_allow_html=True
     )
 
+def render_avatar_download(content, content_type, display_username, key="dl_current"):
+    """Download button for the current avatar, or a disabled placeholder when it is unavailable."""
+    if content is None:
+        st.button("Current N/A", disabled=True, use_container_width=True, key=f"{key}_na")
+        return
+    extension = mimetypes.guess_extension(content_type or '') or '.png'
+    st.download_button(
+        label="Download Current",
+        data=content,
+        file_name=f"avatar_{display_username}{extension}",
+        mime=content_type or "image/png",
+        use_container_width=True,
+        key=key
+    )
+
+@st.fragment(run_every=1)
+def avatar_download_pending(avatar_url, display_username):
+    """
+    Poll the background avatar download while it is pending.
+    
+    Once it settles, the whole app reruns a single time so the regular render
+    path shows the button and this polling fragment is no longer scheduled
+    (it would otherwise resend the avatar bytes every second).
+    """
+    content, content_type, error = get_avatar(avatar_url)
+    if content is None and error is None:
+        st.button("Loading avatar...", disabled=True, use_container_width=True, key="dl_current_loading")
+        return
+    st.rerun()
+
 def render_account_info(user_data):
     """Render the account information statistics."""
     st.markdown("---")
@@ -156,73 +190,128 @@ def render_account_info(user_data):
     
     st.markdown("---")
 
-def render_repos_list(user_data):
-    """Render the list of public repositories."""
-    repos_list = user_data.get('repos_list', [])
+LANG_COLORS = {
+    'Python': '#3572A5', 'JavaScript': '#f1e05a', 'TypeScript': '#2b7489',
+    'Java': '#b07219', 'C++': '#f34b7d', 'C': '#555555', 'C#': '#178600',
+    'Go': '#00ADD8', 'Rust': '#dea584', 'Ruby': '#701516', 'PHP': '#4F5D95',
+    'Swift': '#ffac45', 'Kotlin': '#F18E33', 'HTML': '#e34c26', 'CSS': '#563d7c',
+    'Shell': '#89e051', 'Jupyter Notebook': '#DA5B0B', 'Vue': '#2c3e50',
+    'Dart': '#00B4AB', 'R': '#198CE7', 'Scala': '#c22d40', 'Lua': '#000080',
+}
+
+# Precompiled HTML templates; styling lives in the classes of styles.CSS
+REPO_CARD = '<div class="repo-card"><p class="repo-name">{name}</p>{desc}{meta}</div>'.format
+REPO_DESC = '<p class="repo-desc">{}</p>'.format
+REPO_META = '<div class="repo-meta">{}</div>'.format
+REPO_LANG = '<span class="repo-lang"><span class="lang-dot"{style}></span>{name}</span>'.format
+REPO_STARS = '<span>* {}</span>'.format
+FOLLOW_MORE = '<div class="follow-more">Showing {first}-{last} of {total}</div>'.format
+EMPTY_LIST = '<div class="empty-list">{}</div>'.format
+SECTION_TITLE = '<p style="font-weight: 600; font-size: 0.9rem; color: #333333; margin-bottom: 0.75rem;{extra}">{title}</p>'.format
+
+# Items sent to the browser per page of a list
+REPOS_PAGE_SIZE = 10
+FOLLOW_PAGE_SIZE = 100
+
+# Rendered list fragments keyed by (kind, login, list digest, count)
+list_html_cache = ByteLRUCache(max_bytes=8 * 1024 * 1024)
+
+def _list_digest(items) -> str:
+    """Content hash of a repo or follower list, so an updated list renders afresh."""
+    return hashlib.sha1(json.dumps(items, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+@lru_cache(maxsize=256)
+def _language_html(language: str) -> str:
+    color = LANG_COLORS.get(language)
+    style = f' style="background: {color};"' if color else ''
+    return REPO_LANG(style=style, name=escape(language))
+
+def _repo_card(repo: dict) -> str:
+    description = repo.get('description', '') or ''
+    if len(description) > 80:
+        description = description[:80] + "..."
+    language = repo.get('language', '') or ''
+    stars = repo.get('stars', 0) or 0
+    
+    meta = []
+    if language:
+        meta.append(_language_html(language))
+    if stars > 0:
+        meta.append(REPO_STARS(stars))
+    return REPO_CARD(
+        name=escape(repo.get('name', '')),
+        desc=REPO_DESC(escape(description)) if description else '',
+        meta=REPO_META(' '.join(meta)) if meta else ''
+    )
+
+def repos_html(repos_list: list) -> str:
+    """HTML fragment of repository cards, built in one pass."""
+    return '<div class="repo-list">' + ''.join([_repo_card(repo) for repo in repos_list]) + '</div>'
+
+def follow_html(items: list, display_count: int, offset: int = 0) -> str:
+    """HTML fragment of follower/following pills (one page starting at offset), built in one pass."""
+    parts = ['<div class="follow-list">']
+    parts.extend([f'<span>{escape(str(item))}</span>' for item in items])
+    # When only part of the list is shown, say which part
+    if display_count > len(items):
+        parts.append(FOLLOW_MORE(
+            first=format_number(offset + 1), last=format_number(offset + len(items)),
+            total=format_number(display_count)
+        ))
+    parts.append('</div>')
+    return ''.join(parts)
+
+def render_repos_list(user_data, repos_list=None):
+    """Render the list of public repositories, or the page of it given as repos_list."""
+    if repos_list is None:
+        repos_list = user_data.get('repos_list', [])
     repos_count = user_data.get('public_repos', 0)
     
-    st.markdown(f'<p style="font-weight: 600; font-size: 0.9rem; color: #333333; margin-bottom: 0.75rem;">Public Repositories ({repos_count})</p>', unsafe_allow_html=True)
+    st.markdown(SECTION_TITLE(title=f"Public Repositories ({repos_count})", extra=''), unsafe_allow_html=True)
     
     if repos_list:
-        lang_colors = {
-            'Python': '#3572A5', 'JavaScript': '#f1e05a', 'TypeScript': '#2b7489',
-            'Java': '#b07219', 'C++': '#f34b7d', 'C': '#555555', 'C#': '#178600',
-            'Go': '#00ADD8', 'Rust': '#dea584', 'Ruby': '#701516', 'PHP': '#4F5D95',
-            'Swift': '#ffac45', 'Kotlin': '#F18E33', 'HTML': '#e34c26', 'CSS': '#563d7c',
-            'Shell': '#89e051', 'Jupyter Notebook': '#DA5B0B', 'Vue': '#2c3e50',
-            'Dart': '#00B4AB', 'R': '#198CE7', 'Scala': '#c22d40', 'Lua': '#000080',
-        }
-        
-        repos_cards = []
-        for repo in repos_list:
-            repo_name = repo.get('name', '')
-            repo_lang = repo.get('language', '') or ''
-            repo_stars = repo.get('stars', 0)
-            repo_desc = (repo.get('description', '') or '')[:80]
-            if len(repo.get('description', '') or '') > 80:
-                repo_desc += "..."
-            
-            lang_color = lang_colors.get(repo_lang, '#888888')
-            lang_html = f'<span style="display: inline-flex; align-items: center; gap: 4px;"><span style="width: 10px; height: 10px; border-radius: 50%; background: {lang_color};"></span><span style="font-size: 0.75rem; color: #666;">{repo_lang}</span></span>' if repo_lang else ''
-            stars_html = f'<span style="font-size: 0.75rem; color: #666;">* {repo_stars}</span>' if repo_stars > 0 else ''
-            desc_html = f'<p style="margin: 0.5rem 0 0 0; font-size: 0.8rem; color: #666; line-height: 1.4;">{repo_desc}</p>' if repo_desc else ''
-            
-            meta_items = [x for x in [lang_html, stars_html] if x]
-            meta_html = f'<div style="display: flex; gap: 1rem; margin-top: 0.5rem;">{" ".join(meta_items)}</div>' if meta_items else ''
-            
-            card = f'<div style="background: #fff; border: 1px solid #e8e8e8; border-radius: 8px; padding: 0.875rem; margin-bottom: 0.5rem; transition: all 0.2s;"><p style="margin: 0; font-weight: 600; font-size: 0.9rem; color: #111;">{repo_name}</p>{desc_html}{meta_html}</div>'
-            repos_cards.append(card)
-        
-        repos_container = f'<div style="max-height: 320px; overflow-y: auto; padding-right: 4px;">{"".join(repos_cards)}</div>'
-        st.markdown(repos_container, unsafe_allow_html=True)
+        key = ('repos', user_data.get('login'), _list_digest(repos_list))
+        st.markdown(list_html_cache.get_or_create(key, lambda: repos_html(repos_list)), unsafe_allow_html=True)
     else:
-        st.markdown('<div style="background: #fafafa; border: 1px solid #eeeeee; border-radius: 8px; padding: 1rem; color: #888; font-size: 0.85rem;">No public repositories</div>', unsafe_allow_html=True)
+        st.markdown(EMPTY_LIST("No public repositories"), unsafe_allow_html=True)
 
-def render_follow_list(title, items, total_count, key_prefix):
-    """Render a list of followers or following as clickable pills."""
+def render_follow_list(title, items, total_count, key_prefix, login=None, offset=0):
+    """Render a list of followers or following (or one page of it, starting at offset) as pills."""
     # Use the total count passed from API data
     display_count = total_count if total_count is not None else len(items)
     
-    st.markdown(f'<p style="font-weight: 600; font-size: 0.9rem; color: #333333; margin-bottom: 0.75rem; margin-top: 1.5rem;">{title} ({format_number(display_count)})</p>', unsafe_allow_html=True)
+    st.markdown(
+        SECTION_TITLE(title=f"{title} ({format_number(display_count)})", extra=' margin-top: 1.5rem;'),
+        unsafe_allow_html=True
+    )
     
     if items:
-        # Display the pills (limited to first 100 or so from API)
-        # Increased max-height to 350px to show more items
-        html_content = '<div style="background: #fafafa; border: 1px solid #eeeeee; border-radius: 8px; padding: 0.75rem; display: flex; flex-wrap: wrap; gap: 0.5rem; max-height: 350px; overflow-y: auto;">'
-        for item in items:
-            html_content += f'<span style="background: #fff; border: 1px solid #ddd; padding: 4px 10px; border-radius: 16px; font-size: 0.8rem; color: #333; cursor: pointer;">{item}</span>'
-        
-        # If the list is truncated (Api limit 100 vs Total > 100), we can show a small caption
-        if display_count > len(items):
-             html_content += f'<div style="width: 100%; text-align: center; color: #999; font-size: 0.75rem; margin-top: 0.5rem; padding-top: 0.5rem; border-top: 1px dashed #eee;">Showing top {len(items)} of {format_number(display_count)}</div>'
-
-        html_content += '</div>'
-        st.markdown(html_content, unsafe_allow_html=True)
-            
-        return None
+        key = (key_prefix, login, _list_digest(items), display_count, offset)
+        st.markdown(
+            list_html_cache.get_or_create(key, lambda: follow_html(items, display_count, offset)),
+            unsafe_allow_html=True
+        )
     else:
-        st.markdown(f'<div style="background: #fafafa; border: 1px solid #eeeeee; border-radius: 8px; padding: 1rem; color: #888; font-size: 0.85rem;">No {title.lower()}</div>', unsafe_allow_html=True)
-        return None
+        st.markdown(EMPTY_LIST(f"No {title.lower()}"), unsafe_allow_html=True)
+    return None
+
+def render_pager(key_prefix, page, page_count, on_page):
+    """Previous/next controls for a paged list; on_page(new_page) runs as the button callback."""
+    if page_count <= 1:
+        return
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("Prev", key=f"{key_prefix}_prev", disabled=page <= 0, on_click=on_page, args=(page - 1,),
+                  use_container_width=True)
+    with col2:
+        st.markdown(
+            f'<p style="text-align: center; color: #888888; font-size: 0.8rem; margin: 0.5rem 0 0 0;">'
+            f'Page {format_number(page + 1)} of {format_number(page_count)}</p>',
+            unsafe_allow_html=True
+        )
+    with col3:
+        st.button("Next", key=f"{key_prefix}_next", disabled=page >= page_count - 1, on_click=on_page,
+                  args=(page + 1,), use_container_width=True)
 
 def render_hash_breakdown(user_data):
     """Render the hash breakdown educational section."""
@@ -1,6 +1,10 @@
 from datetime import datetime
 from PIL import Image
 import io
+import threading
+
+# Per-thread scratch buffer reused by image_to_bytes
+_buffers = threading.local()
 
 def format_account_age(created_at_str: str) -> tuple:
     """Calculate and format account age from ISO date string."""
@@ -35,9 +39,45 @@ def format_number(n: int) -> str:
     return f"{n:,}"
 
 
-def image_to_bytes(img: Image.Image) -> bytes:
-    """Convert PIL Image to bytes for download."""
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
+def to_palette(img: Image.Image) -> Image.Image:
+    """
+    Convert an RGB image with at most 256 colours to an exact palette ('P') image.
+    
+    Returns the image unchanged when it has more colours or another mode.
+    PNGs of two-colour palette images (every identicon) are written at 1 bit per pixel.
+    """
+    if img.mode != 'RGB':
+        return img
+    colors = img.getcolors(256)
+    if colors is None:
+        return img
+    palette = Image.new('P', (1, 1))
+    palette.putpalette([channel for _, rgb in sorted(colors, key=lambda c: c[1]) for channel in rgb])
+    return img.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+def image_to_bytes(img: Image.Image, palette: bool = True, compress_level: int = 6,
+                   optimize: bool = False, buffer: io.BytesIO = None) -> bytes:
+    """
+    Convert PIL Image to PNG bytes for download.
+    
+    Args:
+        img: Image to encode
+        palette: Write images with few colours as palette PNGs (see to_palette)
+        compress_level: zlib level 0-9; low-colour images compress well even at 1
+        optimize: Let Pillow search for the smallest encoding (slower; implies level 9)
+        buffer: BytesIO to encode into, reused between calls; defaults to a per-thread buffer
+        
+    Returns:
+        bytes: The PNG file
+    """
+    if palette:
+        img = to_palette(img)
+    if buffer is None:
+        buffer = getattr(_buffers, 'buffer', None)
+        if buffer is None:
+            buffer = _buffers.buffer = io.BytesIO()
     buffer.seek(0)
+    buffer.truncate()
+    img.save(buffer, format='PNG', compress_level=compress_level, optimize=optimize)
     return buffer.getvalue()
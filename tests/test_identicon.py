@@ -0,0 +1,31 @@
+import copy
+import pickle
+
+import pytest
+
+from src.identicon import Identicon
+
+
+def test_identicon_is_immutable():
+    identicon = Identicon.from_id(583231)
+    with pytest.raises(AttributeError):
+        identicon.rgb = 0
+    with pytest.raises(AttributeError):
+        del identicon.mask
+
+
+@pytest.mark.parametrize('clone', [
+    lambda identicon: pickle.loads(pickle.dumps(identicon)),
+    copy.copy,
+    copy.deepcopy,
+])
+def test_identicon_round_trips(clone):
+    identicon = Identicon.from_id(583231)
+    restored = clone(identicon)
+
+    assert restored == identicon
+    assert (restored.user_id, restored.md5_hash, restored.mask, restored.rgb) == \
+        (identicon.user_id, identicon.md5_hash, identicon.mask, identicon.rgb)
+    assert restored.to_png(64) == identicon.to_png(64)
+    with pytest.raises(AttributeError):
+        restored.rgb = 0
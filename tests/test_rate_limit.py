@@ -0,0 +1,146 @@
+import pytest
+
+from src.rate_limit import RateLimiter, RateLimitExceeded
+
+KEY = ('core', 'anonymous')
+START = 1000.0
+WINDOW = 3600
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeTime:
+    """Injected clock; sleeps are recorded and, unless frozen, advance the clock."""
+
+    def __init__(self, frozen=False):
+        self.now = START
+        self.frozen = frozen
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        if not self.frozen:
+            self.now += seconds
+
+
+def budget(remaining, limit=60, reset=START + WINDOW, **extra):
+    headers = {
+        'X-RateLimit-Limit': str(limit),
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(reset),
+    }
+    headers.update(extra)
+    return FakeResponse(headers)
+
+
+def limiter(fake, **kwargs):
+    return RateLimiter(clock=fake.clock, sleep=fake.sleep, **kwargs)
+
+
+def test_unknown_key_is_not_throttled():
+    fake = FakeTime()
+    rate_limiter = limiter(fake)
+    for _ in range(100):
+        rate_limiter.acquire(KEY)
+    assert fake.sleeps == []
+
+
+def test_burst_share_is_not_delayed():
+    fake = FakeTime(frozen=True)
+    rate_limiter = limiter(fake)
+    rate_limiter.update(KEY, budget(60))
+    for _ in range(30):
+        rate_limiter.acquire(KEY)
+    assert fake.sleeps == []
+
+
+def test_concurrent_callers_are_staggered_within_max_wait():
+    fake = FakeTime(frozen=True)
+    rate_limiter = limiter(fake, max_wait=5.0, max_queue=8)
+    rate_limiter.update(KEY, budget(60))
+    for _ in range(30):
+        rate_limiter.acquire(KEY)
+
+    # Callers arriving together once the burst is spent take successive slots
+    for _ in range(4):
+        rate_limiter.acquire(KEY)
+    assert fake.sleeps == pytest.approx([0.625, 1.25, 1.875, 2.5])
+
+
+def test_deficit_is_bounded():
+    fake = FakeTime(frozen=True)
+    rate_limiter = limiter(fake, max_wait=5.0, max_queue=8)
+    rate_limiter.update(KEY, budget(60))
+    for _ in range(30 + 20):
+        rate_limiter.acquire(KEY)
+    assert max(fake.sleeps) == pytest.approx(5.0)
+    assert fake.sleeps[-12:] == pytest.approx([5.0] * 12)
+
+    # Once the queue has drained, the next caller is back at the front
+    fake.sleeps.clear()
+    fake.now += 5.0
+    rate_limiter.acquire(KEY)
+    assert fake.sleeps == pytest.approx([0.625])
+
+
+def test_anonymous_budget_is_spent_without_flat_max_wait_sleeps():
+    fake = FakeTime()
+    rate_limiter = limiter(fake, max_wait=5.0)
+    remaining = 60
+    rate_limiter.update(KEY, budget(remaining))
+    sent = 0
+    with pytest.raises(RateLimitExceeded):
+        while True:
+            rate_limiter.acquire(KEY)
+            sent += 1
+            remaining -= 1
+            rate_limiter.update(KEY, budget(remaining))
+
+    # Refused only once GitHub reports the budget exhausted
+    assert sent == 60
+    assert remaining == 0
+    assert max(fake.sleeps) < 1.0
+
+
+def test_conditional_requests_are_not_paced():
+    fake = FakeTime(frozen=True)
+    rate_limiter = limiter(fake)
+    rate_limiter.update(KEY, budget(60))
+    for _ in range(30):
+        rate_limiter.acquire(KEY)
+    for _ in range(10):
+        rate_limiter.acquire(KEY, conditional=True)
+    assert fake.sleeps == []
+
+
+def test_exhausted_budget_raises_until_reset():
+    fake = FakeTime(frozen=True)
+    rate_limiter = limiter(fake)
+    rate_limiter.update(KEY, budget(0))
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        rate_limiter.acquire(KEY)
+    assert excinfo.value.wait == pytest.approx(WINDOW)
+    with pytest.raises(RateLimitExceeded):
+        rate_limiter.acquire(KEY, conditional=True)
+
+    fake.now = START + WINDOW
+    rate_limiter.acquire(KEY)
+    assert fake.sleeps == []
+
+
+def test_retry_after():
+    fake = FakeTime(frozen=True)
+    rate_limiter = limiter(fake, max_wait=5.0)
+    rate_limiter.update(KEY, budget(50, **{'Retry-After': '3'}))
+    rate_limiter.acquire(KEY)
+    assert fake.sleeps == [3.0]
+
+    rate_limiter.update(KEY, budget(50, **{'Retry-After': '60'}))
+    with pytest.raises(RateLimitExceeded):
+        rate_limiter.acquire(KEY)
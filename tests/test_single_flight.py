@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.cache import SingleFlight
+
+
+def _slow(calls, value, delay=0.2):
+    calls.append(value)
+    time.sleep(delay)
+    return value
+
+
+def test_thread_callers_share_one_call():
+    flights = SingleFlight()
+    calls, results = [], []
+    threads = [
+        threading.Thread(target=lambda: results.append(flights.do('k', _slow, calls, 'v')))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ['v']
+    assert results == ['v'] * 5
+    assert flights.shared == 4
+
+
+def test_finished_flight_is_not_reused():
+    flights = SingleFlight()
+    calls = []
+    flights.do('k', _slow, calls, 1, 0)
+    flights.do('k', _slow, calls, 2, 0)
+    assert calls == [1, 2]
+
+
+def test_async_and_thread_callers_join_the_same_flight():
+    flights = SingleFlight()
+    calls = []
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = asyncio.ensure_future(flights.do_async('k', _slow, calls, 'v', executor=executor))
+            await asyncio.sleep(0.05)
+            return await asyncio.gather(
+                asyncio.gather(first, flights.do_async('k', _slow, calls, 'other')),
+                asyncio.to_thread(flights.do, 'k', _slow, calls, 'other'),
+            )
+
+    async_results, thread_result = asyncio.run(main())
+    assert calls == ['v']
+    assert async_results == ['v', 'v']
+    assert thread_result == 'v'
+
+
+def test_leader_exception_reaches_every_caller():
+    flights = SingleFlight()
+    errors = []
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError('boom')
+
+    def call():
+        try:
+            flights.do('k', fail)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ['boom'] * 3
+    # The key is free again afterwards
+    assert flights.do('k', lambda: 'ok') == 'ok'
+
+
+def test_async_leader_exception_reaches_waiters():
+    flights = SingleFlight()
+
+    def fail():
+        time.sleep(0.1)
+        raise ValueError('boom')
+
+    async def main():
+        return await asyncio.gather(
+            flights.do_async('k', fail), flights.do_async('k', fail), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+def test_cancelling_one_waiter_keeps_the_shared_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def main():
+        first = asyncio.ensure_future(flights.do_async('k', _slow, calls, 'v'))
+        second = asyncio.ensure_future(flights.do_async('k', _slow, calls, 'v'))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        return await second, first
+
+    result, first = asyncio.run(main())
+    assert result == 'v'
+    assert first.cancelled()
+    assert calls == ['v']
+
+
+def test_shut_down_executor_does_not_leave_the_key_in_flight():
+    flights = SingleFlight()
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(flights.do_async('k', lambda: 'never', executor=executor))
+
+    done = threading.Event()
+    results = []
+
+    def call():
+        results.append(flights.do('k', lambda: 'ok'))
+        done.set()
+
+    threading.Thread(target=call, daemon=True).start()
+    assert done.wait(2), "a later caller blocked on the abandoned flight"
+    assert results == ['ok']